@@ -1,37 +1,98 @@
 import os
-from typing import Optional
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
 from fastapi import HTTPException, Header
 from functools import wraps
 
+# Environment variable and fallback key for each service
+_ENV_BY_SERVICE = {
+    "profiles": "PROFILES_API_KEY",
+    "referrals": "REFERRALS_API_KEY",
+    "notifications": "NOTIFICATIONS_API_KEY",
+    "insurance": "INSURANCE_API_KEY",
+    "master": "MASTER_API_KEY",
+}
+_DEFAULT_BY_SERVICE = {
+    "profiles": "wekare-team-2024-profiles-api",
+    "referrals": "wekare-team-2024-referrals-api",
+    "notifications": "wekare-team-2024-notifications-api",
+    "insurance": "wekare-team-2024-insurance-api",
+    "master": "wekare-dev-2024",
+}
+
+
+def _resolve_service_and_master(service_name: str) -> Tuple[bytes, bytes]:
+    """
+    Resolve the service key and master key, encoded for comparison
+    
+    This is the single source of key resolution for every entry point. An
+    unknown service has no key of its own, so its service key is the master
+    key and only the master key is accepted.
+    """
+    env = os.environ
+    master_key = env.get("MASTER_API_KEY", _DEFAULT_BY_SERVICE["master"]).encode()
+    env_var = _ENV_BY_SERVICE.get(service_name)
+    if env_var is None:
+        return master_key, master_key
+    return env.get(env_var, _DEFAULT_BY_SERVICE[service_name]).encode(), master_key
+
+
+def _keys_match(provided: bytes, service_key: bytes, master_key: bytes) -> bool:
+    """Constant-time compares, combined with a non-short-circuiting OR, so timing leaks nothing about the keys"""
+    return hmac.compare_digest(provided, service_key) | hmac.compare_digest(provided, master_key)
+
+
+# Short-lived cache of successful (service, key) authentications for the
+# FastAPI dependencies. Only successes are cached; entries expire after
+# _AUTH_TTL seconds and the least recently used entry is evicted when full.
+# A rotated or revoked key therefore stays valid for up to _AUTH_TTL (60 s)
+# after the environment changes: call clear_auth_cache() when rotating keys.
+# The dependencies are sync and run in FastAPI's threadpool, so every cache
+# read/update/evict sequence holds _auth_cache_lock.
+_AUTH_TTL = 60.0
+_AUTH_CACHE_MAX_SIZE = 1024
+_auth_cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+_auth_cache_lock = threading.Lock()
+
+
+def clear_auth_cache() -> None:
+    """Clear cached API key authentications (call on key rotation; useful for testing)"""
+    with _auth_cache_lock:
+        _auth_cache.clear()
+
+
 class APIKeyManager:
     """Centralized API key management"""
     
     @staticmethod
     def get_service_api_key(service_name: str) -> str:
         """Get API key for specific service from environment"""
-        key_map = {
-            "profiles": os.getenv("PROFILES_API_KEY", "wekare-team-2024-profiles-api"),
-            "referrals": os.getenv("REFERRALS_API_KEY", "wekare-team-2024-referrals-api"),
-            "notifications": os.getenv("NOTIFICATIONS_API_KEY", "wekare-team-2024-notifications-api"),
-            "insurance": os.getenv("INSURANCE_API_KEY", "wekare-team-2024-insurance-api"),
-            "master": os.getenv("MASTER_API_KEY", "wekare-dev-2024")
-        }
-        return key_map.get(service_name, "")
+        if service_name not in _ENV_BY_SERVICE:
+            return ""
+        return _resolve_service_and_master(service_name)[0].decode()
     
     @staticmethod
     def verify_service_api_key(service_name: str, provided_key: str) -> bool:
         """Verify API key for specific service"""
-        expected_key = APIKeyManager.get_service_api_key(service_name)
-        master_key = APIKeyManager.get_service_api_key("master")
-        
         # Allow both service-specific key and master key
-        return provided_key in [expected_key, master_key]
+        return _keys_match(provided_key.encode(), *_resolve_service_and_master(service_name))
     
     @staticmethod
     def create_api_key_dependency(service_name: str):
         """Create FastAPI dependency for API key verification"""
         def verify_api_key(x_api_key: str = Header(..., description=f"API Key for {service_name} service")):
-            if not APIKeyManager.verify_service_api_key(service_name, x_api_key):
+            cache_key = (service_name, x_api_key)
+            now = time.monotonic()
+            with _auth_cache_lock:
+                authenticated_at = _auth_cache.get(cache_key)
+                if authenticated_at is not None and now - authenticated_at < _AUTH_TTL:
+                    _auth_cache.move_to_end(cache_key)
+                    return True
+            
+            if not _keys_match(x_api_key.encode(), *_resolve_service_and_master(service_name)):
                 raise HTTPException(
                     status_code=401,
                     detail={
@@ -45,13 +106,19 @@ class APIKeyManager:
                         ]
                     }
                 )
+            
+            with _auth_cache_lock:
+                _auth_cache[cache_key] = now
+                _auth_cache.move_to_end(cache_key)
+                if len(_auth_cache) > _AUTH_CACHE_MAX_SIZE:
+                    _auth_cache.popitem(last=False)
             return True
         return verify_api_key
 
 # General verify function for backward compatibility
 def verify(api_key: str, service_name: str = "master") -> bool:
     """General API key verification function"""
-    return APIKeyManager.verify_service_api_key(service_name, api_key)
+    return _keys_match(api_key.encode(), *_resolve_service_and_master(service_name))
 
 # Service-specific dependencies
 verify_profiles_api_key = APIKeyManager.create_api_key_dependency("profiles")
@@ -5,7 +5,6 @@ Shared Configuration Module for WeKare Microservices
 from .base_config import (
     SharedInfrastructureConfig, 
     ConfigurationBuilder,
-    shared_config, 
     get_shared_config,
     set_global_config,
     create_development_config,
@@ -22,4 +21,11 @@ __all__ = [
     "create_development_config",
     "create_testing_config",
     "create_production_config"
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    """Resolve the legacy ``shared_config`` lazily"""
+    if name == "shared_config":
+        return get_shared_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,90 @@
+"""
+In-memory cache of parsed .env files
+
+Parsed values are keyed on (absolute path, mtime_ns, size) so repeated
+configuration loads reuse the parsed mapping until the file changes on disk.
+The file is stat'ed on every load, so changes are picked up immediately.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import IO, Dict, Optional, Tuple, Union
+from dotenv import dotenv_values
+
+_CacheKey = Tuple[str, int, int]
+
+_cache: Dict[_CacheKey, Dict[str, Optional[str]]] = {}
+_lock = threading.Lock()
+
+
+def _file_signature(abspath: str) -> Tuple[int, int]:
+    """Get (mtime_ns, size) for a file"""
+    stat = os.stat(abspath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def cached_env_values(path: Union[str, Path]) -> Dict[str, Optional[str]]:
+    """
+    Get the parsed values of an env file, parsing it only when it changed
+
+    Args:
+        path: Path to the .env file
+
+    Returns:
+        Mapping of variable names to values (shared; must not be mutated)
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    abspath = os.path.abspath(path)
+    key = (abspath, *_file_signature(abspath))
+
+    values = _cache.get(key)
+    if values is None:
+        with _lock:
+            values = _cache.get(key)
+            if values is None:
+                with open(abspath, "r", encoding="utf-8", buffering=65536) as stream:
+                    values = dotenv_values(stream=stream)
+                # Drop entries for older versions of the same file
+                for stale_key in [k for k in _cache if k[0] == abspath]:
+                    del _cache[stale_key]
+                _cache[key] = values
+    return values
+
+
+def _apply_env_values(values: Dict[str, Optional[str]], override: bool) -> None:
+    """Copy parsed values into os.environ, like dotenv.load_dotenv"""
+    environ = os.environ
+    for name, value in values.items():
+        if value is not None and (override or name not in environ):
+            environ[name] = value
+
+
+def load_env_file(path: Union[str, Path], override: bool = False) -> None:
+    """
+    Apply a cached env file to os.environ, like dotenv.load_dotenv
+
+    Args:
+        path: Path to the .env file
+        override: Whether to replace variables that are already set
+    """
+    _apply_env_values(cached_env_values(path), override)
+
+
+def load_env_stream(stream: IO[str], override: bool = False) -> None:
+    """
+    Apply env values read from an open text stream (not cached)
+
+    Args:
+        stream: File-like object with .env content, e.g. io.StringIO
+        override: Whether to replace variables that are already set
+    """
+    _apply_env_values(dotenv_values(stream=stream), override)
+
+
+def clear() -> None:
+    """Clear all cached env files (useful for testing)"""
+    with _lock:
+        _cache.clear()
@@ -9,6 +9,10 @@ class Base(DeclarativeBase):
 
 class BaseTable:
     """Base mixin for all tables"""
+    # Fetch server-generated defaults (created_at/updated_at) with RETURNING
+    # during flush, so new rows need no refresh round-trip
+    __mapper_args__ = {"eager_defaults": True}
+    
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
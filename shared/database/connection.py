@@ -1,18 +1,19 @@
 import asyncpg
 import asyncio
-from typing import Optional, AsyncGenerator
+from typing import Any, AsyncGenerator, Iterable, List, Optional, Sequence
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 import os
-from functools import lru_cache
 from dotenv import load_dotenv
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import QueuePool
-from sqlalchemy import text
+from sqlalchemy import event, text
 import structlog
 import traceback
+from shared.config.base_config import SharedInfrastructureConfig
 
 # Load environment variables
 load_dotenv(dotenv_path=".env.local")
@@ -23,17 +24,70 @@ logger = logging.getLogger(__name__)
 # Get structured logger for database connections
 logger = structlog.get_logger("shared.database.connection")
 
+# asyncpg connection settings: skip the JIT for short OLTP queries, tag
+# connections for pg_stat_activity, detect half-open sockets with TCP
+# keepalives, bound every statement's runtime and keep more prepared
+# statements per connection (a cache miss re-prepares and re-introspects
+# the statement's parameter and result types)
+ASYNCPG_CONNECT_ARGS = {
+    "server_settings": {
+        "jit": "off",
+        "application_name": "wekare",
+        "tcp_keepalives_idle": "30",
+        "tcp_keepalives_interval": "10",
+        "tcp_keepalives_count": "5",
+    },
+    "command_timeout": 60,
+    "prepared_statement_cache_size": 500,
+}
+
+# Startup probe: server info and the service schemas in a single query
+STARTUP_PROBE_SQL = """
+    SELECT current_database(), current_user, version(),
+           ARRAY(
+               SELECT schema_name
+               FROM information_schema.schemata
+               WHERE schema_name IN ('profiles', 'referrals', 'insurance', 'notifications')
+               ORDER BY schema_name
+           )
+"""
+
 class DatabaseConnection:
     def __init__(self):
         self.engine = None
         self.session_factory = None
         self.database_url = None
+        self.pg_pool: Optional[asyncpg.Pool] = None
+        # Pool event counters since connect(), maintained by event listeners
+        self._pool_counters = {"checkouts": 0, "checkins": 0, "invalidated": 0}
         logger.info("🔧 DatabaseConnection initialized")
 
-    async def connect(self, database_url: str):
-        """Connect to database with comprehensive logging"""
+    async def connect(self, database_url: str,
+                      pool_size: Optional[int] = None,
+                      max_overflow: Optional[int] = None,
+                      pool_timeout: int = 30,
+                      pool_recycle: int = 1800,
+                      pool_pre_ping: bool = True):
+        """
+        Connect to database with comprehensive logging
+        
+        Args:
+            database_url: SQLAlchemy database URL
+            pool_size: Connections kept open in the pool (default: DB_POOL_SIZE setting)
+            max_overflow: Extra connections allowed under burst load (default: DB_MAX_OVERFLOW setting)
+            pool_timeout: Seconds to wait for a free connection
+            pool_recycle: Seconds after which connections are replaced (before idle/NAT timeouts)
+            pool_pre_ping: Check connections for liveness on checkout
+        """
         self.database_url = database_url
         
+        if pool_size is None or max_overflow is None:
+            settings = SharedInfrastructureConfig.cached()
+            if pool_size is None:
+                pool_size = settings.db_pool_size
+            if max_overflow is None:
+                max_overflow = settings.db_max_overflow
+        
         # Mask password in URL for logging
         safe_url = database_url
         if '@' in database_url:
@@ -47,58 +101,52 @@ class DatabaseConnection:
                    connection_type="async postgresql")
         
         try:
+            engine_kwargs = {}
+            if "+asyncpg" in database_url:
+                engine_kwargs["connect_args"] = ASYNCPG_CONNECT_ARGS
+            
             # Create engine with connection pooling
             self.engine = create_async_engine(
                 database_url,
-                pool_size=5,
-                max_overflow=10,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-                echo=False  # Set to True for SQL query logging
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+                echo=False,  # Set to True for SQL query logging
+                **engine_kwargs
             )
             
             logger.info("🛠️ Database engine created", 
-                       pool_size=5,
-                       max_overflow=10,
-                       pool_pre_ping=True,
-                       pool_recycle=3600)
+                       pool_size=pool_size,
+                       max_overflow=max_overflow,
+                       pool_timeout=pool_timeout,
+                       pool_pre_ping=pool_pre_ping,
+                       pool_recycle=pool_recycle)
             
             # Create session factory
             self.session_factory = async_sessionmaker(
                 bind=self.engine,
                 class_=AsyncSession,
-                expire_on_commit=False
+                expire_on_commit=False,
+                autoflush=False
             )
             
             logger.info("🏭 Session factory created")
             
-            # Test connection
-            async with self.engine.begin() as conn:
-                result = await conn.execute(text("SELECT 1"))
-                test_result = result.scalar()
-                
-                logger.info("✅ Database connection test successful", 
-                           test_query_result=test_result)
+            self._install_pool_listeners()
             
-            # Test session creation
-            async with self.session_factory() as session:
-                result = await session.execute(text("SELECT current_database(), current_user, version()"))
+            # Test connection: one round-trip for server info and available schemas
+            async with self.engine.begin() as conn:
+                result = await conn.execute(text(STARTUP_PROBE_SQL))
                 db_info = result.first()
                 
-                logger.info("✅ Database session test successful", 
+                logger.info("✅ Database connection test successful", 
                            current_database=db_info[0] if db_info else "unknown",
                            current_user=db_info[1] if db_info else "unknown",
                            postgresql_version=db_info[2][:50] if db_info and db_info[2] else "unknown")
                 
-                # Check for schema
-                schema_result = await session.execute(text("""
-                    SELECT schema_name 
-                    FROM information_schema.schemata 
-                    WHERE schema_name IN ('profiles', 'referrals', 'insurance', 'notifications')
-                    ORDER BY schema_name
-                """))
-                schemas = [row[0] for row in schema_result.fetchall()]
-                
+                schemas = list(db_info[3] or []) if db_info else []
                 logger.info("📋 Available schemas", 
                            schemas=schemas,
                            schema_count=len(schemas))
@@ -114,11 +162,108 @@ class DatabaseConnection:
                         traceback=traceback.format_exc())
             raise
 
+    def _install_pool_listeners(self) -> None:
+        """Count pool checkouts, checkins and invalidations for get_pool_stats()"""
+        counters = self._pool_counters
+        for name in counters:
+            counters[name] = 0
+
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            counters["checkouts"] += 1
+
+        def on_checkin(dbapi_connection, connection_record):
+            counters["checkins"] += 1
+
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            counters["invalidated"] += 1
+
+        sync_engine = self.engine.sync_engine
+        event.listen(sync_engine, "checkout", on_checkout)
+        event.listen(sync_engine, "checkin", on_checkin)
+        event.listen(sync_engine, "invalidate", on_invalidate)
+
+    def get_pool_stats(self) -> dict:
+        """
+        Get connection pool statistics from the pool's own counters (no queries)
+
+        Returns:
+            Dict with size, checked_in, checked_out, overflow and invalid (current
+            pool state), plus checkouts and checkins since connect()
+        """
+        if not self.engine:
+            raise RuntimeError("Database connection not established")
+
+        pool = self.engine.pool
+        counters = self._pool_counters
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "invalid": counters["invalidated"],
+            "checkouts": counters["checkouts"],
+            "checkins": counters["checkins"],
+        }
+
+    async def connect_asyncpg(self, dsn: str,
+                              min_size: int = 10,
+                              max_size: int = 50,
+                              max_queries: int = 50000,
+                              max_inactive_connection_lifetime: float = 300,
+                              statement_cache_size: int = 1024):
+        """
+        Create a raw asyncpg pool for hot read paths that don't need the ORM
+        
+        Args:
+            dsn: PostgreSQL DSN (a SQLAlchemy "postgresql+asyncpg://" URL is accepted)
+            min_size: Connections opened up front
+            max_size: Maximum pool size
+            max_queries: Queries after which a connection is replaced
+            max_inactive_connection_lifetime: Seconds before idle connections are closed
+            statement_cache_size: Prepared statements cached per connection
+        """
+        dsn = dsn.replace("postgresql+asyncpg://", "postgresql://", 1)
+        
+        self.pg_pool = await asyncpg.create_pool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            max_queries=max_queries,
+            max_inactive_connection_lifetime=max_inactive_connection_lifetime,
+            statement_cache_size=statement_cache_size,
+            server_settings=ASYNCPG_CONNECT_ARGS["server_settings"],
+            command_timeout=ASYNCPG_CONNECT_ARGS["command_timeout"]
+        )
+        
+        logger.info("🏊 asyncpg pool created", 
+                   min_size=min_size,
+                   max_size=max_size,
+                   statement_cache_size=statement_cache_size)
+
+    def _require_pg_pool(self) -> asyncpg.Pool:
+        if self.pg_pool is None:
+            logger.error("❌ asyncpg pool not initialized")
+            raise RuntimeError("asyncpg pool not established")
+        return self.pg_pool
+
+    async def fetch(self, query: str, *args) -> List[asyncpg.Record]:
+        """Run a query on the asyncpg pool and return all rows (uses $1, $2... placeholders)"""
+        return await self._require_pg_pool().fetch(query, *args)
+
+    async def executemany(self, query: str, args: Iterable[Sequence[Any]]) -> None:
+        """Run a statement on the asyncpg pool once per argument tuple"""
+        await self._require_pg_pool().executemany(query, args)
+
     async def disconnect(self):
         """Disconnect from database with logging"""
         logger.info("🔌 Disconnecting from database")
         
         try:
+            if self.pg_pool:
+                await self.pg_pool.close()
+                self.pg_pool = None
+                logger.info("✅ asyncpg pool closed successfully")
+            
             if self.engine:
                 await self.engine.dispose()
                 logger.info("✅ Database engine disposed successfully")
@@ -203,17 +348,37 @@ class DatabaseConnection:
                         error_type=type(e).__name__)
             return False
 
+    def check_pool(self) -> bool:
+        """
+        Check that the engine and its pool exist, without querying the database
+        
+        Cheap enough for frequent liveness probes, but it does not prove the
+        database is reachable; use check_connection() for that.
+        """
+        if not self.engine:
+            logger.warning("⚠️ Database engine not initialized")
+            return False
+        
+        logger.info("✅ Database pool check successful",
+                   pool_status=self.engine.pool.status())
+        return True
+
 # Global database connection instance
 db = DatabaseConnection()
 
-@lru_cache()
+# Database URL read from the environment on first use
+@lru_cache(maxsize=1)
 def get_database_url() -> str:
-    """Get database URL from environment"""
+    """Get database URL from environment (cached; clear with get_database_url.cache_clear())"""
     database_url = os.getenv("DATABASE_URL")
     if not database_url:
         raise ValueError("DATABASE_URL environment variable is required")
     return database_url
 
+def reset_database_url_cache() -> None:
+    """Forget the cached database URL (useful for testing)"""
+    get_database_url.cache_clear()
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency for database sessions"""
     if not db.session_factory:
@@ -226,5 +391,32 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         finally:
             logger.info("🔄 FastAPI dependency session closed", session_id=id(session))
 
+async def get_db_readonly() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency for read-only endpoints (never commits)"""
+    if not db.session_factory:
+        raise RuntimeError("Database connection not established")
+
+    async with db.session_factory() as session:
+        yield session
+
+async def get_db_with_commit() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that commits once the endpoint has finished
+
+    The transaction is rolled back if the endpoint raises. Requires
+    FastAPI >= 0.106, where dependency exit code runs before the response
+    is sent, so a failed commit surfaces to the client as a 500.
+    """
+    if not db.session_factory:
+        raise RuntimeError("Database connection not established")
+
+    async with db.session_factory() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
 # Alias for convenience
 get_db_session = get_session
\ No newline at end of file
@@ -1,43 +1,108 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, List, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, TypeVar, Generic, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import Select, bindparam, func, literal, select, insert, update, delete
 from sqlalchemy.orm import selectinload
 from uuid import UUID
 
 T = TypeVar('T')
 
+# Rows per INSERT statement in bulk_create (keeps bind parameter counts bounded)
+BULK_CREATE_CHUNK_SIZE = 1000
+
+# Statement templates built once per model; values are bound at execution time
+@lru_cache(maxsize=512)
+def _stmt_get_by_id(model_class: type) -> Select:
+    return select(model_class).where(getattr(model_class, "id") == bindparam("id"))
+
+
+@lru_cache(maxsize=512)
+def _stmt_exists(model_class: type) -> Select:
+    return select(literal(1)).where(getattr(model_class, "id") == bindparam("id")).limit(1)
+
+
+@lru_cache(maxsize=512)
+def _stmt_get_all_order(model_class: type, order_by: Optional[str]) -> Select:
+    stmt = select(model_class)
+    if order_by and hasattr(model_class, order_by):
+        stmt = stmt.order_by(getattr(model_class, order_by))
+    elif hasattr(model_class, 'created_at'):
+        # Default ordering by created_at if available
+        stmt = stmt.order_by(getattr(model_class, 'created_at').desc())
+    return stmt
+
+
+@lru_cache(maxsize=512)
+def _stmt_by_org(model_class: type) -> Select:
+    return select(model_class).where(
+        getattr(model_class, 'organization_id') == bindparam("organization_id")
+    )
+
+
+@lru_cache(maxsize=512)
+def _stmt_count(model_class: type) -> Select:
+    return select(func.count()).select_from(model_class)
+
+
 class BaseRepository(Generic[T], ABC):
     def __init__(self, session: AsyncSession, model_class: type[T]):
         self.session = session
         self.model_class = model_class
+        # Multi-tenancy is a property of the model, so check it once
+        self._is_multitenant = hasattr(model_class, 'organization_id')
     
     async def create(self, **kwargs) -> T:
         """Create new record"""
+        # Go through the ORM constructor so __init__ logic, @validates hooks
+        # and relationship kwargs behave as usual
         instance = self.model_class(**kwargs)
         self.session.add(instance)
+        # Server defaults are loaded by the flush itself (eager_defaults on BaseTable)
         await self.session.flush()
-        await self.session.refresh(instance)
         return instance
     
+    async def bulk_create(self, rows: List[Dict[str, Any]], chunk_size: int = BULK_CREATE_CHUNK_SIZE) -> List[T]:
+        """
+        Create many records with one multi-row INSERT ... RETURNING per chunk
+        
+        Rows are plain column dicts; unlike create(), the model constructor and
+        ORM hooks are not run.
+        """
+        created: List[T] = []
+        row_iter = iter(rows)
+        while chunk := list(islice(row_iter, chunk_size)):
+            stmt = insert(self.model_class).values(chunk).returning(self.model_class)
+            result = await self.session.execute(stmt)
+            created.extend(result.scalars().all())
+        return created
+    
     async def get_by_id(self, id: UUID) -> Optional[T]:
         """Get record by ID"""
-        stmt = select(self.model_class).where(getattr(self.model_class, "id") == id)
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(_stmt_get_by_id(self.model_class), {"id": id})
         return result.scalar_one_or_none()
     
+    async def exists(self, id: UUID) -> bool:
+        """Check whether a record exists without loading it"""
+        result = await self.session.execute(_stmt_exists(self.model_class), {"id": id})
+        return result.scalar() is not None
+    
+    def _with_eager(self, stmt: Select, eager: Tuple[str, ...]) -> Select:
+        """Add selectinload options for the named relationships"""
+        for rel in eager:
+            stmt = stmt.options(selectinload(getattr(self.model_class, rel)))
+        return stmt
+    
     async def get_all(self, limit: Optional[int] = None, offset: Optional[int] = None, 
-                     order_by: Optional[str] = None) -> List[T]:
-        """Get all records with optional pagination and ordering"""
-        stmt = select(self.model_class)
+                     order_by: Optional[str] = None, eager: Tuple[str, ...] = ()) -> List[T]:
+        """
+        Get all records with optional pagination and ordering
         
-        # Add ordering if specified
-        if order_by and hasattr(self.model_class, order_by):
-            order_column = getattr(self.model_class, order_by)
-            stmt = stmt.order_by(order_column)
-        elif hasattr(self.model_class, 'created_at'):
-            # Default ordering by created_at if available
-            stmt = stmt.order_by(getattr(self.model_class, 'created_at').desc())
+        Relationships named in eager are loaded with one extra SELECT ... IN
+        query each, instead of one lazy load per row.
+        """
+        stmt = self._with_eager(_stmt_get_all_order(self.model_class, order_by), eager)
         
         # Add pagination if specified
         if offset is not None:
@@ -48,15 +113,27 @@ class BaseRepository(Generic[T], ABC):
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
     
-    async def get_by_organization(self, organization_id: UUID) -> List[T]:
+    async def iter_all(self, chunk_size: int = 500, order_by: Optional[str] = None) -> AsyncIterator[T]:
+        """
+        Stream all records through a server-side cursor
+        
+        Rows are fetched chunk_size at a time, so memory stays bounded for
+        large tables. Use get_all() for small or paginated result sets.
+        """
+        stmt = _stmt_get_all_order(self.model_class, order_by).execution_options(yield_per=chunk_size)
+        result = await self.session.stream_scalars(stmt)
+        async for row in result:
+            yield row
+    
+    async def get_by_organization(self, organization_id: UUID, eager: Tuple[str, ...] = ()) -> List[T]:
         """Get records by organization (for multi-tenant models)"""
-        if hasattr(self.model_class, 'organization_id'):
-            stmt = select(self.model_class).where(
-                getattr(self.model_class, 'organization_id', None) == organization_id
-            )
-            result = await self.session.execute(stmt)
-            return list(result.scalars().all())
-        raise AttributeError(f"{self.model_class.__name__} is not multi-tenant")
+        if not self._is_multitenant:
+            raise AttributeError(f"{self.model_class.__name__} is not multi-tenant")
+        result = await self.session.execute(
+            self._with_eager(_stmt_by_org(self.model_class), eager),
+            {"organization_id": organization_id}
+        )
+        return list(result.scalars().all())
     
     async def update(self, id: UUID, **kwargs) -> Optional[T]:
         """Update record"""
@@ -68,13 +145,14 @@ class BaseRepository(Generic[T], ABC):
     
     async def delete(self, id: UUID) -> bool:
         """Delete record"""
+        # Built per call with the literal id (not a cached bindparam template):
+        # the ORM's "evaluate" session sync needs the value to evict a loaded
+        # instance from the identity map
         stmt = delete(self.model_class).where(getattr(self.model_class, "id") == id)
         result = await self.session.execute(stmt)
         return result.rowcount > 0
     
     async def count(self) -> int:
         """Get total count of records"""
-        from sqlalchemy import func
-        stmt = select(func.count(getattr(self.model_class, 'id')))
-        result = await self.session.execute(stmt)
-        return result.scalar_one()
\ No newline at end of file
+        result = await self.session.execute(_stmt_count(self.model_class))
+        return result.scalar_one()
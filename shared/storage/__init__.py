@@ -3,5 +3,6 @@ Storage utilities for WeKare Shared Infrastructure
 """
 
 from .s3_client import S3Client, S3Config
+from .async_s3_client import AsyncS3Client, get_async_s3_client
 
-__all__ = ["S3Client", "S3Config"] 
\ No newline at end of file
+__all__ = ["S3Client", "S3Config", "AsyncS3Client", "get_async_s3_client"] 
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""
+Async AWS S3 Storage Client for WeKare Shared Infrastructure
+
+Provides an asyncio-native S3 client built on aioboto3 so FastAPI handlers
+can overlap S3 operations instead of blocking the event loop.
+
+aioboto3 is an optional dependency. Install it with the ``async`` extra:
+    pip install wekare-shared[async]
+"""
+
+import asyncio
+from typing import Optional, Dict, Any, Union, List
+from pathlib import Path
+from botocore.config import Config
+from botocore.exceptions import ClientError
+import structlog
+from shared.config.base_config import SharedInfrastructureConfig
+from shared.storage.s3_client import S3Config
+
+try:
+    import aioboto3
+except ImportError:  # pragma: no cover - exercised only without the optional extra
+    aioboto3 = None
+
+# Set up logging
+logger = structlog.get_logger("shared.storage.async_s3_client")
+
+
+class _ThreadedFileReader:
+    """Async read() over a local file; each read runs in a worker thread so disk I/O never blocks the event loop"""
+
+    def __init__(self, file_obj):
+        self._file = file_obj
+
+    async def read(self, size: int = -1) -> bytes:
+        return await asyncio.to_thread(self._file.read, size)
+
+
+class AsyncS3Client:
+    """
+    Async AWS S3 Client sharing the same S3Config as S3Client
+
+    The underlying aioboto3 client is opened on first use and reused for the
+    lifetime of the AsyncS3Client. Use it as an async context manager or call
+    close() when done.
+
+    Example:
+        async with AsyncS3Client(S3Config(bucket_name="my-bucket")) as s3:
+            objects = await s3.get_many(["a.txt", "b.txt"])
+    """
+
+    def __init__(self, config: Union[S3Config, SharedInfrastructureConfig, None] = None):
+        """Initialize async S3 client with configuration"""
+        if aioboto3 is None:
+            raise ImportError(
+                "aioboto3 is required for AsyncS3Client. "
+                "Install it with: pip install wekare-shared[async]"
+            )
+
+        if config is None:
+            self.config = S3Config.from_shared_config()
+        elif isinstance(config, SharedInfrastructureConfig):
+            self.config = S3Config.from_shared_config(config)
+        else:
+            self.config = config
+
+        self._session = None
+        self._client = None
+        self._client_context = None
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        self._client_lock = asyncio.Lock()
+
+        logger.info("🪣 AsyncS3Client initialized",
+                   bucket=self.config.bucket_name,
+                   region=self.config.region,
+                   max_concurrency=self.config.max_concurrency)
+
+    async def __aenter__(self) -> "AsyncS3Client":
+        await self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def _get_client(self):
+        """Lazy initialization of the aioboto3 S3 client"""
+        if self._client is not None:
+            return self._client
+
+        # Concurrent first callers (e.g. get_many) must not each open a client
+        async with self._client_lock:
+            if self._client is None:
+                session_kwargs = {}
+                if self.config.access_key_id and self.config.secret_access_key:
+                    session_kwargs.update({
+                        "aws_access_key_id": self.config.access_key_id,
+                        "aws_secret_access_key": self.config.secret_access_key
+                    })
+
+                if self.config.region:
+                    session_kwargs["region_name"] = self.config.region
+
+                self._session = aioboto3.Session(**session_kwargs)
+
+                client_kwargs = {
+                    "service_name": "s3",
+                    "use_ssl": self.config.use_ssl,
+                    "config": Config(
+                        signature_version=self.config.signature_version,
+                        max_pool_connections=self.config.max_concurrency
+                    )
+                }
+
+                if self.config.endpoint_url:
+                    client_kwargs["endpoint_url"] = self.config.endpoint_url
+
+                self._client_context = self._session.client(**client_kwargs)
+                self._client = await self._client_context.__aenter__()
+
+                logger.info("✅ Async S3 client created successfully",
+                           bucket=self.config.bucket_name,
+                           region=self.config.region)
+        return self._client
+
+    async def close(self) -> None:
+        """Close the underlying aioboto3 client"""
+        if self._client_context is not None:
+            await self._client_context.__aexit__(None, None, None)
+            logger.info("🔌 Async S3 client closed", bucket=self.config.bucket_name)
+        self._client = None
+        self._client_context = None
+
+    async def upload_file(self, file_path: Union[str, Path], s3_key: str,
+                          metadata: Optional[Dict[str, str]] = None,
+                          content_type: Optional[str] = None) -> bool:
+        """
+        Upload a file to S3
+
+        Args:
+            file_path: Path to the local file to upload
+            s3_key: S3 key (path) where the file will be stored
+            metadata: Optional metadata to attach to the object
+            content_type: Optional content type for the object
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            file_path = Path(file_path)
+            if not file_path.exists():
+                logger.error("❌ File not found", file_path=str(file_path))
+                return False
+
+            extra_args = {}
+            if metadata:
+                extra_args["Metadata"] = metadata
+            if content_type:
+                extra_args["ContentType"] = content_type
+
+            logger.info("📤 Uploading file to S3",
+                       file_path=str(file_path),
+                       s3_key=s3_key,
+                       bucket=self.config.bucket_name)
+
+            client = await self._get_client()
+            async with self._semaphore:
+                file_obj = await asyncio.to_thread(open, file_path, "rb")
+                try:
+                    await client.upload_fileobj(
+                        _ThreadedFileReader(file_obj),
+                        self.config.bucket_name,
+                        s3_key,
+                        ExtraArgs=extra_args if extra_args else None
+                    )
+                finally:
+                    await asyncio.to_thread(file_obj.close)
+
+            logger.info("✅ File uploaded successfully",
+                       s3_key=s3_key,
+                       bucket=self.config.bucket_name)
+            return True
+
+        except ClientError as e:
+            logger.error("❌ S3 upload failed", error=str(e), s3_key=s3_key)
+            return False
+        except Exception as e:
+            logger.error("❌ Unexpected error during upload", error=str(e))
+            return False
+
+    async def get_object(self, s3_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get object from S3 with metadata
+
+        Args:
+            s3_key: S3 key (path) of the object
+
+        Returns:
+            Dict with object data and metadata, None if not found
+        """
+        try:
+            logger.info("🔍 Getting object from S3",
+                       s3_key=s3_key,
+                       bucket=self.config.bucket_name)
+
+            client = await self._get_client()
+            async with self._semaphore:
+                response = await client.get_object(
+                    Bucket=self.config.bucket_name,
+                    Key=s3_key
+                )
+                body = await response["Body"].read()
+
+            result = {
+                "Body": body,
+                "ContentType": response.get("ContentType"),
+                "ContentLength": response.get("ContentLength"),
+                "LastModified": response.get("LastModified"),
+                "Metadata": response.get("Metadata", {}),
+                "ETag": response.get("ETag")
+            }
+
+            logger.info("✅ Object retrieved successfully",
+                       s3_key=s3_key,
+                       size=result["ContentLength"])
+            return result
+
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchKey":
+                logger.warning("⚠️ Object not found in S3", s3_key=s3_key)
+            else:
+                logger.error("❌ Failed to get object", error=str(e), s3_key=s3_key)
+            return None
+        except Exception as e:
+            logger.error("❌ Unexpected error getting object", error=str(e))
+            return None
+
+    async def object_exists(self, s3_key: str) -> bool:
+        """
+        Check if an object exists in S3
+
+        Args:
+            s3_key: S3 key (path) of the object to check
+
+        Returns:
+            bool: True if object exists, False otherwise
+        """
+        try:
+            client = await self._get_client()
+            async with self._semaphore:
+                await client.head_object(
+                    Bucket=self.config.bucket_name,
+                    Key=s3_key
+                )
+            return True
+
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "404":
+                logger.error("❌ Error checking object existence", error=str(e), s3_key=s3_key)
+            return False
+        except Exception as e:
+            logger.error("❌ Unexpected error checking object existence", error=str(e))
+            return False
+
+    async def get_many(self, s3_keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get multiple objects concurrently
+
+        At most config.max_concurrency requests are in flight at once.
+
+        Args:
+            s3_keys: S3 keys (paths) of the objects
+
+        Returns:
+            List of results in the same order as s3_keys (None for missing objects)
+        """
+        return list(await asyncio.gather(*(self.get_object(key) for key in s3_keys)))
+
+
+def get_async_s3_client(config: Optional[Union[S3Config, SharedInfrastructureConfig]] = None) -> AsyncS3Client:
+    """Get an async S3 client instance"""
+    return AsyncS3Client(config)
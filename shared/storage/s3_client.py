@@ -6,8 +6,13 @@ configurable settings, and proper error handling.
 """
 
 import os
+import threading
+from functools import lru_cache
 import boto3
-from typing import Optional, Dict, Any, BinaryIO, Union, List
+from boto3.s3.transfer import TransferConfig
+from typing import Optional, Dict, Any, BinaryIO, Union, List, Tuple
+from botocore import UNSIGNED
+from botocore.compat import HAS_CRT
 from botocore.exceptions import ClientError, NoCredentialsError
 from dataclasses import dataclass
 from pathlib import Path
@@ -18,16 +23,20 @@ from shared.config.base_config import SharedInfrastructureConfig
 # Set up logging
 logger = structlog.get_logger("shared.storage.s3_client")
 
-@dataclass
+MB = 1024 * 1024
+
+@dataclass(frozen=True, slots=True)
 class S3Config:
-    """S3 Configuration dataclass"""
+    """S3 Configuration dataclass (immutable and hashable; use dataclasses.replace to derive variants)"""
     bucket_name: str
     region: Optional[str] = None
     access_key_id: Optional[str] = None
     secret_access_key: Optional[str] = None
     endpoint_url: Optional[str] = None
     use_ssl: bool = True
-    signature_version: str = "s3v4"
+    signature_version: str = "s3v4"  # botocore.UNSIGNED for anonymous (public bucket) access
+    multipart_threshold: int = 100 * MB  # Objects at or above this size use managed multipart transfers
+    max_concurrency: int = 10
     
     @classmethod
     def from_shared_config(cls, config: Optional[SharedInfrastructureConfig] = None) -> "S3Config":
@@ -94,6 +103,62 @@ class S3Config:
             signature_version="s3v4"
         )
 
+# boto3 clients are thread-safe, so every S3Client with the same connection
+# settings shares one session and client per process. Failed builds are not
+# cached (lru_cache does not store exceptions).
+_client_lock = threading.Lock()
+
+@lru_cache(maxsize=32)
+def _build_boto_client(key: Tuple) -> Tuple[Any, Any]:
+    """Create a boto3 session and S3 client for a connection settings key"""
+    region, endpoint_url, access_key_id, secret_access_key, use_ssl, signature_version = key
+    
+    # Create session with credentials if provided
+    session_kwargs = {}
+    if access_key_id and secret_access_key:
+        session_kwargs.update({
+            "aws_access_key_id": access_key_id,
+            "aws_secret_access_key": secret_access_key
+        })
+        
+    if region:
+        session_kwargs["region_name"] = region
+        
+    session = boto3.Session(**session_kwargs)
+    
+    # Resolve the credential chain once up front so the first API call
+    # doesn't pay for it. Missing credentials only fail here for signed
+    # requests against AWS: unsigned (public bucket) clients never need them,
+    # and custom endpoints (e.g. local emulators) may accept anonymous access
+    if signature_version is not UNSIGNED:
+        credentials = session.get_credentials()
+        if credentials is not None:
+            credentials.get_frozen_credentials()
+        elif not endpoint_url:
+            raise NoCredentialsError()
+    
+    # Create S3 client
+    client_kwargs = {
+        "service_name": "s3",
+        "use_ssl": use_ssl,
+        "config": boto3.session.Config(
+            signature_version=signature_version
+        )
+    }
+    
+    if endpoint_url:
+        client_kwargs["endpoint_url"] = endpoint_url
+        
+    client = session.client(**client_kwargs)
+    
+    # botocore routes SigV4 signing through the awscrt (C) signer
+    # automatically when awscrt is installed (the ``crt`` extra)
+    logger.info("✅ S3 client created successfully", 
+               region=region,
+               crt_signing=HAS_CRT)
+    
+    return session, client
+
 class S3Client:
     """
     AWS S3 Client with comprehensive read/write capabilities
@@ -113,6 +178,10 @@ class S3Client:
             
         self._client = None
         self._session = None
+        self._transfer_config = TransferConfig(
+            multipart_threshold=self.config.multipart_threshold,
+            max_concurrency=self.config.max_concurrency
+        )
         
         logger.info("🪣 S3Client initialized", 
                    bucket=self.config.bucket_name,
@@ -126,40 +195,22 @@ class S3Client:
             self._client = self._create_client()
         return self._client
     
+    def _client_key(self) -> Tuple:
+        """Connection settings that determine the boto3 client (bucket is per call)"""
+        return (
+            self.config.region,
+            self.config.endpoint_url,
+            self.config.access_key_id,
+            self.config.secret_access_key,
+            self.config.use_ssl,
+            self.config.signature_version,
+        )
+    
     def _create_client(self):
-        """Create boto3 S3 client with configuration"""
+        """Get the shared boto3 S3 client for this configuration"""
         try:
-            # Create session with credentials if provided
-            session_kwargs = {}
-            if self.config.access_key_id and self.config.secret_access_key:
-                session_kwargs.update({
-                    "aws_access_key_id": self.config.access_key_id,
-                    "aws_secret_access_key": self.config.secret_access_key
-                })
-                
-            if self.config.region:
-                session_kwargs["region_name"] = self.config.region
-                
-            self._session = boto3.Session(**session_kwargs)
-            
-            # Create S3 client
-            client_kwargs = {
-                "service_name": "s3",
-                "use_ssl": self.config.use_ssl,
-                "config": boto3.session.Config(
-                    signature_version=self.config.signature_version
-                )
-            }
-            
-            if self.config.endpoint_url:
-                client_kwargs["endpoint_url"] = self.config.endpoint_url
-                
-            client = self._session.client(**client_kwargs)
-            
-            logger.info("✅ S3 client created successfully", 
-                       bucket=self.config.bucket_name,
-                       region=self.config.region)
-            
+            with _client_lock:
+                self._session, client = _build_boto_client(self._client_key())
             return client
             
         except NoCredentialsError:
@@ -546,6 +597,11 @@ class S3Client:
         """
         Copy an object within S3
         
+        Uses the managed transfer copy: objects below the multipart threshold
+        are copied with a single CopyObject call, larger ones with a parallel
+        multipart UploadPartCopy (which also supports objects beyond the 5 GB
+        CopyObject limit).
+        
         Args:
             source_key: Source S3 key
             destination_key: Destination S3 key
@@ -575,11 +631,12 @@ class S3Client:
                        source_bucket=source_bucket,
                        dest_bucket=self.config.bucket_name)
                        
-            self.client.copy_object(
+            self.client.copy(
                 CopySource=copy_source,
                 Bucket=self.config.bucket_name,
                 Key=destination_key,
-                **extra_args
+                ExtraArgs=extra_args if extra_args else None,
+                Config=self._transfer_config
             )
             
             logger.info("✅ Object copied successfully", 
@@ -35,6 +35,66 @@ def clean_environment():
     os.environ.update(original_env)
 
 
+@pytest.fixture(autouse=True)
+def clear_env_file_cache():
+    """Start every test with an empty parsed env file cache"""
+    from shared.config import _env_cache
+    _env_cache.clear()
+    yield
+    _env_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_boto_client_cache():
+    """Start every test without shared boto3 clients, so Session mocks are used"""
+    from shared.storage.s3_client import _build_boto_client
+    _build_boto_client.cache_clear()
+    yield
+    _build_boto_client.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def clean_jwt_env(monkeypatch):
+    """Start every test without JWT settings (e.g. loaded from a local .env); set them with monkeypatch"""
+    monkeypatch.delenv("JWT_SECRET", raising=False)
+    monkeypatch.delenv("JWT_ALGORITHM", raising=False)
+
+
+@pytest.fixture(scope="session")
+def _config_cache():
+    """Session-wide cache of configurations keyed on the full environment they were built from"""
+    return {}
+
+
+@pytest.fixture
+def config_factory(monkeypatch, _config_cache):
+    """
+    Build a SharedInfrastructureConfig for an environment dict, reusing an
+    already-validated instance when it was built from the same environment.
+    
+    The environment changes are applied (through monkeypatch) on every call,
+    and the cache key is the resulting os.environ, so a hit never depends on
+    the ambient environment or on test order. Cached configs are shared
+    between tests and must not be mutated.
+    """
+    from shared.config.base_config import SharedInfrastructureConfig
+    
+    def make(env=None, clear=False):
+        if clear:
+            for name in list(os.environ):
+                monkeypatch.delenv(name)
+        for name, value in (env or {}).items():
+            monkeypatch.setenv(name, value)
+        
+        key = frozenset(os.environ.items())
+        config = _config_cache.get(key)
+        if config is None:
+            config = _config_cache[key] = SharedInfrastructureConfig()
+        return config
+    
+    return make
+
+
 @pytest.fixture
 def test_environment():
     """Provide test environment variables"""
@@ -79,10 +139,11 @@ def sample_jwt_payload():
     """Provide a sample JWT payload for testing"""
     from datetime import datetime, timedelta
     
+    now = datetime.utcnow()
     return {
         "sub": "user123",
-        "iat": datetime.utcnow(),
-        "exp": datetime.utcnow() + timedelta(hours=1),
+        "iat": now,
+        "exp": now + timedelta(hours=1),
         "aud": "wekare-app",
         "iss": "wekare-auth",
         "user_id": "123",
@@ -92,6 +153,59 @@ def sample_jwt_payload():
     }
 
 
+# Pre-encoded JWTs, signed once per session with TEST_JWT_SECRET
+TEST_JWT_SECRET = "test-secret-key"
+
+
+@pytest.fixture(scope="session")
+def jwt_secret():
+    """Provide the secret the session token fixtures are signed with"""
+    return TEST_JWT_SECRET
+
+
+@pytest.fixture(scope="session")
+def valid_hs256_token():
+    """Provide a valid HS256 token for user 123"""
+    import jwt
+
+    return jwt.encode({"user_id": "123", "username": "testuser"}, TEST_JWT_SECRET, algorithm="HS256")
+
+
+@pytest.fixture(scope="session")
+def expired_hs256_token():
+    """Provide an HS256 token that expired an hour ago"""
+    import jwt
+    from datetime import datetime, timedelta
+
+    payload = {
+        "user_id": "123",
+        "username": "testuser",
+        "exp": datetime.utcnow() - timedelta(hours=1)
+    }
+    return jwt.encode(payload, TEST_JWT_SECRET, algorithm="HS256")
+
+
+@pytest.fixture(scope="session")
+def realistic_payload_token():
+    """Provide an HS256 token with a realistic claim set (valid for an hour)"""
+    import jwt
+    from datetime import datetime, timedelta
+
+    now = datetime.utcnow()
+    payload = {
+        "sub": "user123",
+        "iat": now,
+        "exp": now + timedelta(hours=1),
+        "aud": "wekare-app",
+        "iss": "wekare-auth",
+        "user_id": "123",
+        "username": "johndoe",
+        "email": "john@example.com",
+        "roles": ["user", "patient"]
+    }
+    return jwt.encode(payload, TEST_JWT_SECRET, algorithm="HS256")
+
+
 @pytest.fixture
 def mock_model_instance():
     """Create a mock model instance for repository testing"""
@@ -3,10 +3,13 @@ Tests for API Keys module
 """
 import pytest
 import os
+import hmac
 from unittest.mock import patch, MagicMock
 from fastapi import HTTPException
 from shared.auth.api_keys import (
     APIKeyManager, 
+    _auth_cache,
+    clear_auth_cache,
     verify, 
     verify_profiles_api_key,
     verify_referrals_api_key,
@@ -16,6 +19,14 @@ from shared.auth.api_keys import (
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_auth_cache():
+    """Ensure cached authentications don't leak between tests"""
+    clear_auth_cache()
+    yield
+    clear_auth_cache()
+
+
 class TestAPIKeyManager:
     """Test the APIKeyManager class"""
     
@@ -47,6 +58,20 @@ class TestAPIKeyManager:
             assert APIKeyManager.get_service_api_key("insurance") == "test-insurance-key"
             assert APIKeyManager.get_service_api_key("master") == "test-master-key"
     
+    def test_unknown_service_returns_empty_fast_path(self):
+        """Test unknown services resolve to an empty key without touching the environment"""
+        with patch("shared.auth.api_keys.os.environ") as mock_environ:
+            assert APIKeyManager.get_service_api_key("unknown") == ""
+            assert APIKeyManager.get_service_api_key("") == ""
+            mock_environ.get.assert_not_called()
+    
+    def test_get_service_api_key_tracks_env_changes(self):
+        """Test environment changes are picked up on the next lookup"""
+        with patch.dict(os.environ, {"PROFILES_API_KEY": "first-key"}):
+            assert APIKeyManager.get_service_api_key("profiles") == "first-key"
+            os.environ["PROFILES_API_KEY"] = "second-key"
+            assert APIKeyManager.get_service_api_key("profiles") == "second-key"
+    
     def test_verify_service_api_key_with_correct_key(self):
         """Test API key verification with correct service key"""
         test_env = {"PROFILES_API_KEY": "test-profiles-key"}
@@ -83,6 +108,25 @@ class TestAPIKeyManager:
             # Referrals key should not work for profiles service
             assert APIKeyManager.verify_service_api_key("profiles", "test-referrals-key") is False
     
+    def test_constant_time_comparison_used(self):
+        """Test API key verification compares against both keys in constant time"""
+        test_env = {
+            "PROFILES_API_KEY": "test-profiles-key",
+            "MASTER_API_KEY": "test-master-key"
+        }
+        
+        with patch.dict(os.environ, test_env), \
+             patch("hmac.compare_digest", wraps=hmac.compare_digest) as mock_compare:
+            assert APIKeyManager.verify_service_api_key("profiles", "test-profiles-key") is True
+            # Both the service and master key comparisons run even after a match
+            assert mock_compare.call_count == 2
+            compared = {call.args[1] for call in mock_compare.call_args_list}
+            assert compared == {b"test-profiles-key", b"test-master-key"}
+            
+            # Wrong keys of varying shared-prefix lengths are all rejected
+            for wrong_key in ["", "t", "test-", "test-profiles-ke", "test-profiles-keyX", "x" * 64]:
+                assert APIKeyManager.verify_service_api_key("profiles", wrong_key) is False
+    
     def test_create_api_key_dependency_success(self):
         """Test creating FastAPI dependency that passes validation"""
         test_env = {"PROFILES_API_KEY": "test-profiles-key"}
@@ -93,6 +137,94 @@ class TestAPIKeyManager:
             result = dependency("test-profiles-key")
             assert result is True
     
+    def test_dependency_caches_positive_result(self):
+        """Test a successful authentication is cached for repeat requests"""
+        with patch.dict(os.environ, {"PROFILES_API_KEY": "test-profiles-key"}), \
+             patch("hmac.compare_digest", wraps=hmac.compare_digest) as mock_compare:
+            dependency = APIKeyManager.create_api_key_dependency("profiles")
+            assert dependency("test-profiles-key") is True
+            assert dependency("test-profiles-key") is True
+        
+        assert mock_compare.call_count == 2
+    
+    def test_dependency_cache_expires(self):
+        """Test cached authentications are re-verified after the TTL"""
+        with patch.dict(os.environ, {"PROFILES_API_KEY": "test-profiles-key"}), \
+             patch("hmac.compare_digest", wraps=hmac.compare_digest) as mock_compare, \
+             patch("shared.auth.api_keys.time.monotonic", side_effect=[0.0, 61.0]):
+            dependency = APIKeyManager.create_api_key_dependency("profiles")
+            dependency("test-profiles-key")
+            dependency("test-profiles-key")
+        
+        assert mock_compare.call_count == 4
+    
+    def test_dependency_cache_evicts_least_recently_used(self):
+        """Test a cache hit protects an entry from eviction when the cache is full"""
+        test_env = {
+            "PROFILES_API_KEY": "test-profiles-key",
+            "REFERRALS_API_KEY": "test-referrals-key",
+            "MASTER_API_KEY": "test-master-key"
+        }
+        with patch.dict(os.environ, test_env), \
+             patch("shared.auth.api_keys._AUTH_CACHE_MAX_SIZE", 2):
+            profiles = APIKeyManager.create_api_key_dependency("profiles")
+            referrals = APIKeyManager.create_api_key_dependency("referrals")
+            profiles("test-profiles-key")
+            profiles("test-master-key")
+            profiles("test-profiles-key")  # Hit: now most recently used
+            referrals("test-referrals-key")
+        
+        assert list(_auth_cache) == [("profiles", "test-profiles-key"), ("referrals", "test-referrals-key")]
+    
+    def test_dependency_cache_is_accessed_under_lock(self):
+        """Test every cache read/update/evict holds the lock (dependencies run in a threadpool)"""
+        from collections import OrderedDict
+        from shared.auth import api_keys
+        
+        class LockCheckingCache(OrderedDict):
+            def _check(self):
+                assert api_keys._auth_cache_lock.locked()
+            
+            def get(self, *args):
+                self._check()
+                return super().get(*args)
+            
+            def move_to_end(self, *args, **kwargs):
+                self._check()
+                return super().move_to_end(*args, **kwargs)
+            
+            def __setitem__(self, *args):
+                self._check()
+                return super().__setitem__(*args)
+            
+            def popitem(self, *args, **kwargs):
+                self._check()
+                return super().popitem(*args, **kwargs)
+        
+        test_env = {"PROFILES_API_KEY": "test-profiles-key", "MASTER_API_KEY": "test-master-key"}
+        with patch.dict(os.environ, test_env), \
+             patch("shared.auth.api_keys._AUTH_CACHE_MAX_SIZE", 1), \
+             patch("shared.auth.api_keys._auth_cache", LockCheckingCache()) as cache:
+            dependency = APIKeyManager.create_api_key_dependency("profiles")
+            assert dependency("test-profiles-key") is True
+            assert dependency("test-profiles-key") is True  # Hit
+            assert dependency("test-master-key") is True  # Evicts
+        
+        assert list(cache) == [("profiles", "test-master-key")]
+    
+    def test_dependency_does_not_cache_failures(self):
+        """Test failed authentications are never cached"""
+        with patch.dict(os.environ, {"PROFILES_API_KEY": "test-profiles-key"}):
+            dependency = APIKeyManager.create_api_key_dependency("profiles")
+            
+            for _ in range(2):
+                with pytest.raises(HTTPException):
+                    dependency("wrong-key")
+            
+            # A now-valid key must still be verified rather than served from cache
+            with patch.dict(os.environ, {"PROFILES_API_KEY": "wrong-key"}):
+                assert dependency("wrong-key") is True
+    
     def test_create_api_key_dependency_failure(self):
         """Test creating FastAPI dependency that fails validation"""
         test_env = {"PROFILES_API_KEY": "test-profiles-key"}
@@ -127,6 +259,37 @@ class TestVerifyFunction:
             assert verify("wrong-key") is False
             assert verify("wrong-key", "master") is False
     
+    def test_verify_uses_constant_time_comparison(self):
+        """Test verify function goes through the constant-time comparison"""
+        test_env = {"MASTER_API_KEY": "test-master-key"}
+        
+        with patch.dict(os.environ, test_env), \
+             patch("hmac.compare_digest", wraps=hmac.compare_digest) as mock_compare:
+            assert verify("test-master-key") is True
+            assert verify("wrong-key", "profiles") is False
+            # Both keys are always compared, with no master-key short circuit
+            assert mock_compare.call_count == 4
+    
+    def test_verify_unknown_service(self):
+        """Test verify rejects non-master keys for unknown services"""
+        with patch.dict(os.environ, {"MASTER_API_KEY": "test-master-key"}):
+            assert verify("", "unknown") is False
+            assert verify("test-master-key", "unknown") is True
+    
+    def test_unknown_service_consistent_across_entry_points(self):
+        """Test every entry point accepts only the master key for unknown services"""
+        with patch.dict(os.environ, {"MASTER_API_KEY": "test-master-key"}):
+            dependency = APIKeyManager.create_api_key_dependency("unknown")
+            for key in ["", "wekare-team-2024-profiles-api"]:
+                assert verify(key, "unknown") is False
+                assert APIKeyManager.verify_service_api_key("unknown", key) is False
+                with pytest.raises(HTTPException):
+                    dependency(key)
+            
+            assert verify("test-master-key", "unknown") is True
+            assert APIKeyManager.verify_service_api_key("unknown", "test-master-key") is True
+            assert dependency("test-master-key") is True
+    
     def test_verify_with_service_key(self):
         """Test verify function with service-specific key"""
         test_env = {"PROFILES_API_KEY": "test-profiles-key"}
@@ -139,13 +302,17 @@ class TestVerifyFunction:
 class TestServiceDependencies:
     """Test the pre-created service dependencies"""
     
-    def test_verify_profiles_api_key_success(self):
-        """Test profiles API key dependency success"""
-        test_env = {"PROFILES_API_KEY": "test-profiles-key"}
-        
-        with patch.dict(os.environ, test_env):
-            result = verify_profiles_api_key("test-profiles-key")
-            assert result is True
+    @pytest.mark.parametrize("env_var,key,dependency", [
+        ("PROFILES_API_KEY", "test-profiles-key", verify_profiles_api_key),
+        ("REFERRALS_API_KEY", "test-referrals-key", verify_referrals_api_key),
+        ("NOTIFICATIONS_API_KEY", "test-notifications-key", verify_notifications_api_key),
+        ("INSURANCE_API_KEY", "test-insurance-key", verify_insurance_api_key),
+        ("MASTER_API_KEY", "test-master-key", verify_master_api_key),
+    ])
+    def test_verify_service_dependency_success(self, env_var, key, dependency, monkeypatch):
+        """Test each service API key dependency accepts its own key"""
+        monkeypatch.setenv(env_var, key)
+        assert dependency(key) is True
     
     def test_verify_profiles_api_key_failure(self):
         """Test profiles API key dependency failure"""
@@ -158,49 +325,17 @@ class TestServiceDependencies:
             assert exc_info.value.status_code == 401
             assert "profiles" in str(exc_info.value.detail)
     
-    def test_verify_referrals_api_key_success(self):
-        """Test referrals API key dependency success"""
-        test_env = {"REFERRALS_API_KEY": "test-referrals-key"}
-        
-        with patch.dict(os.environ, test_env):
-            result = verify_referrals_api_key("test-referrals-key")
-            assert result is True
-    
-    def test_verify_notifications_api_key_success(self):
-        """Test notifications API key dependency success"""
-        test_env = {"NOTIFICATIONS_API_KEY": "test-notifications-key"}
-        
-        with patch.dict(os.environ, test_env):
-            result = verify_notifications_api_key("test-notifications-key")
-            assert result is True
-    
-    def test_verify_insurance_api_key_success(self):
-        """Test insurance API key dependency success"""
-        test_env = {"INSURANCE_API_KEY": "test-insurance-key"}
-        
-        with patch.dict(os.environ, test_env):
-            result = verify_insurance_api_key("test-insurance-key")
-            assert result is True
-    
-    def test_verify_master_api_key_success(self):
-        """Test master API key dependency success"""
-        test_env = {"MASTER_API_KEY": "test-master-key"}
-        
-        with patch.dict(os.environ, test_env):
-            result = verify_master_api_key("test-master-key")
-            assert result is True
-    
-    def test_all_dependencies_accept_master_key(self):
+    @pytest.mark.parametrize("dependency", [
+        verify_profiles_api_key,
+        verify_referrals_api_key,
+        verify_notifications_api_key,
+        verify_insurance_api_key,
+        verify_master_api_key,
+    ])
+    def test_all_dependencies_accept_master_key(self, dependency, monkeypatch):
         """Test that all service dependencies accept master key"""
-        test_env = {"MASTER_API_KEY": "test-master-key"}
-        
-        with patch.dict(os.environ, test_env):
-            # All services should accept master key
-            assert verify_profiles_api_key("test-master-key") is True
-            assert verify_referrals_api_key("test-master-key") is True
-            assert verify_notifications_api_key("test-master-key") is True
-            assert verify_insurance_api_key("test-master-key") is True
-            assert verify_master_api_key("test-master-key") is True
+        monkeypatch.setenv("MASTER_API_KEY", "test-master-key")
+        assert dependency("test-master-key") is True
 
 
 class TestAPIKeyIntegration:
@@ -0,0 +1,210 @@
+"""
+Tests for Async S3 Storage module
+"""
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from botocore.exceptions import ClientError
+from shared.storage.async_s3_client import AsyncS3Client
+from shared.storage.s3_client import S3Config
+
+
+@pytest.fixture
+def mock_aioboto3():
+    """Patch aioboto3 with a session whose client context yields an AsyncMock client"""
+    mock_boto_client = AsyncMock()
+    client_context = MagicMock()
+    client_context.__aenter__ = AsyncMock(return_value=mock_boto_client)
+    client_context.__aexit__ = AsyncMock(return_value=None)
+
+    mock_module = MagicMock()
+    mock_module.Session.return_value.client.return_value = client_context
+
+    with patch('shared.storage.async_s3_client.aioboto3', mock_module):
+        yield mock_module, mock_boto_client, client_context
+
+
+class TestAsyncS3Client:
+    """Test the AsyncS3Client class"""
+
+    def test_requires_aioboto3(self):
+        """Test AsyncS3Client raises ImportError when aioboto3 is missing"""
+        with patch('shared.storage.async_s3_client.aioboto3', None):
+            with pytest.raises(ImportError, match="aioboto3 is required"):
+                AsyncS3Client(S3Config(bucket_name="test-bucket"))
+
+    async def test_client_reused_and_closed(self, mock_aioboto3):
+        """Test the aioboto3 client is opened once and closed on exit"""
+        mock_module, mock_boto_client, client_context = mock_aioboto3
+        config = S3Config(bucket_name="test-bucket", region="us-west-2", endpoint_url="http://localhost:9000")
+
+        async with AsyncS3Client(config) as client:
+            assert await client._get_client() is mock_boto_client
+            assert await client._get_client() is mock_boto_client
+
+        mock_module.Session.assert_called_once_with(region_name="us-west-2")
+        client_kwargs = mock_module.Session.return_value.client.call_args[1]
+        assert client_kwargs["endpoint_url"] == "http://localhost:9000"
+        client_context.__aenter__.assert_awaited_once()
+        client_context.__aexit__.assert_awaited_once()
+
+    async def test_upload_file_success(self, mock_aioboto3, tmp_path):
+        """Test upload_file streams the file through upload_fileobj"""
+        _, mock_boto_client, _ = mock_aioboto3
+        file_path = tmp_path / "upload.txt"
+        file_path.write_bytes(b"test content")
+
+        client = AsyncS3Client(S3Config(bucket_name="test-bucket"))
+        result = await client.upload_file(file_path, "test-key", content_type="text/plain")
+
+        assert result is True
+        args, kwargs = mock_boto_client.upload_fileobj.call_args
+        assert args[1:] == ("test-bucket", "test-key")
+        assert kwargs["ExtraArgs"] == {"ContentType": "text/plain"}
+
+    async def test_upload_file_io_runs_off_event_loop(self, mock_aioboto3, tmp_path):
+        """Test upload_file opens, reads and closes the file in worker threads"""
+        _, mock_boto_client, _ = mock_aioboto3
+        file_path = tmp_path / "upload.txt"
+        file_path.write_bytes(b"test content")
+        chunks = []
+
+        async def fake_upload_fileobj(fileobj, bucket, key, ExtraArgs=None):
+            chunks.append(await fileobj.read(4))
+            chunks.append(await fileobj.read())
+
+        mock_boto_client.upload_fileobj.side_effect = fake_upload_fileobj
+
+        client = AsyncS3Client(S3Config(bucket_name="test-bucket"))
+        with patch("shared.storage.async_s3_client.asyncio.to_thread",
+                   wraps=asyncio.to_thread) as mock_to_thread:
+            assert await client.upload_file(file_path, "test-key") is True
+
+        assert chunks == [b"test", b" content"]
+        called = [call.args[0] for call in mock_to_thread.call_args_list]
+        assert called[0] is open
+        assert called[-1].__name__ == "close"
+        assert len(called) == 4  # open, two reads, close
+
+    async def test_upload_file_not_found(self, mock_aioboto3):
+        """Test upload_file with file not found"""
+        _, mock_boto_client, _ = mock_aioboto3
+
+        client = AsyncS3Client(S3Config(bucket_name="test-bucket"))
+        result = await client.upload_file("/non/existent/file.txt", "test-key")
+
+        assert result is False
+        mock_boto_client.upload_fileobj.assert_not_called()
+
+    async def test_get_object_success(self, mock_aioboto3):
+        """Test get_object reads the streaming body"""
+        _, mock_boto_client, _ = mock_aioboto3
+        body = MagicMock()
+        body.read = AsyncMock(return_value=b"test content")
+        mock_boto_client.get_object.return_value = {
+            "Body": body,
+            "ContentType": "text/plain",
+            "ContentLength": 12,
+        }
+
+        client = AsyncS3Client(S3Config(bucket_name="test-bucket"))
+        result = await client.get_object("test-key")
+
+        assert result["Body"] == b"test content"
+        assert result["ContentLength"] == 12
+        assert result["Metadata"] == {}
+        mock_boto_client.get_object.assert_awaited_once_with(Bucket="test-bucket", Key="test-key")
+
+    async def test_get_object_not_found(self, mock_aioboto3):
+        """Test get_object with object not found"""
+        _, mock_boto_client, _ = mock_aioboto3
+        mock_boto_client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey", "Message": "The specified key does not exist"}},
+            "get_object"
+        )
+
+        client = AsyncS3Client(S3Config(bucket_name="test-bucket"))
+        assert await client.get_object("missing-key") is None
+
+    async def test_object_exists(self, mock_aioboto3):
+        """Test object_exists for present and missing objects"""
+        _, mock_boto_client, _ = mock_aioboto3
+        client = AsyncS3Client(S3Config(bucket_name="test-bucket"))
+
+        assert await client.object_exists("test-key") is True
+
+        mock_boto_client.head_object.side_effect = ClientError(
+            {"Error": {"Code": "404", "Message": "Not Found"}},
+            "head_object"
+        )
+        assert await client.object_exists("test-key") is False
+
+    async def test_get_many_preserves_order(self, mock_aioboto3):
+        """Test get_many fetches all keys and returns results in key order"""
+        _, mock_boto_client, _ = mock_aioboto3
+
+        async def fake_get_object(Bucket, Key):
+            body = MagicMock()
+            body.read = AsyncMock(return_value=Key.encode())
+            return {"Body": body}
+
+        mock_boto_client.get_object.side_effect = fake_get_object
+
+        client = AsyncS3Client(S3Config(bucket_name="test-bucket", max_concurrency=2))
+        results = await client.get_many(["a", "b", "c"])
+
+        assert [r["Body"] for r in results] == [b"a", b"b", b"c"]
+        assert mock_boto_client.get_object.await_count == 3
+
+    async def test_get_many_respects_max_concurrency(self, mock_aioboto3):
+        """Test get_many never has more than max_concurrency requests in flight"""
+        _, mock_boto_client, _ = mock_aioboto3
+        in_flight = 0
+        peak = 0
+
+        async def fake_get_object(Bucket, Key):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            body = MagicMock()
+
+            async def read():
+                nonlocal in_flight
+                await asyncio.sleep(0)
+                in_flight -= 1
+                return Key.encode()
+
+            body.read = read
+            return {"Body": body}
+
+        mock_boto_client.get_object.side_effect = fake_get_object
+
+        client = AsyncS3Client(S3Config(bucket_name="test-bucket", max_concurrency=3))
+        keys = [f"key-{i}" for i in range(20)]
+        results = await client.get_many(keys)
+
+        assert [r["Body"] for r in results] == [key.encode() for key in keys]
+        assert peak == 3
+
+    async def test_cold_get_many_opens_one_client(self, mock_aioboto3):
+        """Test concurrent first use opens the aioboto3 client only once"""
+        mock_module, mock_boto_client, client_context = mock_aioboto3
+
+        async def slow_aenter(*args):
+            # Yield so the other coroutines reach _get_client while this one is opening
+            await asyncio.sleep(0)
+            return mock_boto_client
+
+        client_context.__aenter__ = AsyncMock(side_effect=slow_aenter)
+        body = MagicMock()
+        body.read = AsyncMock(return_value=b"data")
+        mock_boto_client.get_object.return_value = {"Body": body}
+
+        client = AsyncS3Client(S3Config(bucket_name="test-bucket"))
+        await client.get_many(["a", "b", "c", "d"])
+        await client.close()
+
+        client_context.__aenter__.assert_awaited_once()
+        client_context.__aexit__.assert_awaited_once()
+        mock_module.Session.assert_called_once()
@@ -2,10 +2,11 @@
 Tests for new configuration features
 """
 import pytest
+import io
 import os
-import tempfile
 from pathlib import Path
 from unittest.mock import patch
+from shared.config import _env_cache
 from shared.config.base_config import (
     SharedInfrastructureConfig,
     ConfigurationBuilder,
@@ -97,28 +98,23 @@ class TestNewConfigurationFeatures:
         assert getattr(config, 'custom_field') == "custom_value"
     
     def test_from_env_file(self):
-        """Test loading from environment file"""
-        # Create a temporary .env file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as tmp_env:
-            tmp_env.write("""
+        """Test loading from an in-memory environment file"""
+        env_stream = io.StringIO("""
 AWS_S3_BUCKET_NAME=env-file-bucket
 AWS_S3_REGION=us-west-1
 ENVIRONMENT=staging
 DEBUG=false
 LOG_LEVEL=WARNING
 """)
-            tmp_env_path = tmp_env.name
         
-        try:
-            config = SharedInfrastructureConfig.from_env_file(tmp_env_path)
-            
-            assert config.aws_s3_bucket_name == "env-file-bucket"
-            assert config.aws_s3_region == "us-west-1"
-            assert config.environment == "staging"
-            assert config.debug is False
-            assert config.log_level == "WARNING"
-        finally:
-            os.unlink(tmp_env_path)
+        with patch.dict(os.environ, {}, clear=True):
+            config = SharedInfrastructureConfig.from_env_file(env_stream)
+        
+        assert config.aws_s3_bucket_name == "env-file-bucket"
+        assert config.aws_s3_region == "us-west-1"
+        assert config.environment == "staging"
+        assert config.debug is False
+        assert config.log_level == "WARNING"
     
     def test_from_dict(self):
         """Test creating config from dictionary"""
@@ -158,28 +154,25 @@ LOG_LEVEL=WARNING
         assert isinstance(auto_config, SharedInfrastructureConfig)
         assert auto_config is not global_config
     
-    def test_has_s3_config_method(self):
+    def test_has_s3_config_method(self, config_factory):
         """Test has_s3_config method"""
-        # Clear environment to ensure clean test state
-        with patch.dict(os.environ, {}, clear=True):
-            config_with_s3 = SharedInfrastructureConfig(aws_s3_bucket_name="test-bucket")
-            config_without_s3 = SharedInfrastructureConfig()
-            
-            assert config_with_s3.has_s3_config() is True
-            assert config_without_s3.has_s3_config() is False
+        config_with_s3 = config_factory(clear=True).model_copy(update={"aws_s3_bucket_name": "test-bucket"})
+        
+        assert config_with_s3.has_s3_config() is True
+        assert config_factory(clear=True).has_s3_config() is False
     
-    def test_get_s3_config_dict_method(self):
+    def test_get_s3_config_dict_method(self, config_factory):
         """Test get_s3_config_dict method"""
-        config = SharedInfrastructureConfig(
-            aws_s3_bucket_name="test-bucket",
-            aws_s3_region="us-west-2",
-            aws_region="us-east-1",  # Should be used as fallback
-            aws_access_key_id="test-key",
-            aws_secret_access_key="test-secret",
-            aws_s3_endpoint_url="http://localhost:9000",
-            aws_s3_use_ssl=False,
-            aws_s3_signature_version="s3v2"
-        )
+        config = config_factory(clear=True).model_copy(update={
+            "aws_s3_bucket_name": "test-bucket",
+            "aws_s3_region": "us-west-2",
+            "aws_region": "us-east-1",  # Should be used as fallback
+            "aws_access_key_id": "test-key",
+            "aws_secret_access_key": "test-secret",
+            "aws_s3_endpoint_url": "http://localhost:9000",
+            "aws_s3_use_ssl": False,
+            "aws_s3_signature_version": "s3v2",
+        })
         
         s3_dict = config.get_s3_config_dict()
         
@@ -191,40 +184,83 @@ LOG_LEVEL=WARNING
         assert s3_dict["use_ssl"] is False
         assert s3_dict["signature_version"] == "s3v2"
     
-    def test_get_s3_config_dict_with_fallback_region(self):
+    def test_s3_config_dict_built_lazily(self, config_factory):
+        """Test the S3 mapping is assembled on first use and reused afterwards"""
+        config = config_factory(clear=True).model_copy(update={"aws_s3_bucket_name": "test-bucket"})
+        assert "_s3_config_view" not in config.__dict__
+        
+        first = config.get_s3_config_dict()
+        second = config.get_s3_config_dict()
+        
+        assert "_s3_config_view" in config.__dict__
+        assert first == second
+        assert first is not second  # Callers get their own copy
+        assert "_s3_config_view" not in config.model_dump()
+    
+    def test_s3_config_dict_rebuilt_after_aws_setting_changes(self, config_factory):
+        """Test assigning an aws_* setting invalidates the cached S3 mapping"""
+        config = config_factory(clear=True).model_copy(update={"aws_s3_bucket_name": "old-bucket"})
+        assert config.get_s3_config_dict()["bucket_name"] == "old-bucket"
+        
+        config.aws_s3_bucket_name = "new-bucket"
+        
+        assert config.has_s3_config() is True
+        assert config.get_s3_config_dict()["bucket_name"] == "new-bucket"
+        assert config.to_dict()["aws_s3_bucket_name"] == "new-bucket"
+    
+    def test_cached_views_rebuilt_when_any_setting_changes(self, config_factory):
+        """Test any assignment drops the cached mappings, not just aws_* ones"""
+        config = config_factory(clear=True).model_copy(update={"aws_s3_bucket_name": "test-bucket", "log_level": "INFO"})
+        s3_view = config._s3_config_view
+        view = config.as_view()
+        
+        config.log_level = "DEBUG"
+        
+        assert config._s3_config_view is not s3_view
+        assert config.as_view() is not view
+        assert config.as_view()["log_level"] == "DEBUG"
+        assert config.to_dict()["log_level"] == "DEBUG"
+    
+    def test_model_copy_recomputes_cached_values(self, config_factory):
+        """Test copies never inherit cached values derived from the original"""
+        original = config_factory(clear=True).model_copy(update={"aws_s3_bucket_name": "original-bucket"})
+        original.get_s3_config_dict()
+        assert original.is_development is True
+        
+        copied = original.model_copy(update={"aws_s3_bucket_name": "copied-bucket", "environment": "production"})
+        
+        assert copied.get_s3_config_dict()["bucket_name"] == "copied-bucket"
+        assert copied.is_development is False
+        assert copied.is_production is True
+    
+    def test_get_s3_config_dict_with_fallback_region(self, config_factory):
         """Test get_s3_config_dict with fallback to aws_region"""
-        # Clear environment to ensure clean test state
-        with patch.dict(os.environ, {}, clear=True):
-            config = SharedInfrastructureConfig(
-                aws_s3_bucket_name="test-bucket",
-                aws_region="us-east-1",  # Should be used as fallback
-                # aws_s3_region not set
-            )
-            
-            s3_dict = config.get_s3_config_dict()
-            assert s3_dict["region"] == "us-east-1"  # Should fall back to aws_region
+        config = config_factory(clear=True).model_copy(update={
+            "aws_s3_bucket_name": "test-bucket",
+            "aws_region": "us-east-1",  # Should be used as fallback
+            # aws_s3_region not set
+        })
+        
+        s3_dict = config.get_s3_config_dict()
+        assert s3_dict["region"] == "us-east-1"  # Should fall back to aws_region
     
-    def test_flexible_initialization_parameters(self):
+    def test_flexible_initialization_parameters(self, tmp_path):
         """Test flexible initialization parameters"""
         # Clear environment to ensure clean test state
         with patch.dict(os.environ, {}, clear=True):
             # Test with env_files parameter
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as tmp_env:
-                tmp_env.write("AWS_S3_BUCKET_NAME=param-bucket\n")
-                tmp_env_path = tmp_env.name
+            tmp_env_path = tmp_path / "params.env"
+            tmp_env_path.write_text("AWS_S3_BUCKET_NAME=param-bucket\n")
             
-            try:
-                config = SharedInfrastructureConfig(
-                    env_files=[tmp_env_path],
-                    environment="custom",
-                    debug=False
-                )
-                
-                assert config.aws_s3_bucket_name == "param-bucket"
-                assert config.environment == "custom"
-                assert config.debug is False
-            finally:
-                os.unlink(tmp_env_path)
+            config = SharedInfrastructureConfig(
+                env_files=[str(tmp_env_path)],
+                environment="custom",
+                debug=False
+            )
+            
+            assert config.aws_s3_bucket_name == "param-bucket"
+            assert config.environment == "custom"
+            assert config.debug is False
     
     def test_env_file_not_exists_handling(self):
         """Test graceful handling of non-existent env files"""
@@ -234,22 +270,89 @@ LOG_LEVEL=WARNING
     
     def test_builder_with_env_file(self):
         """Test builder pattern with env files"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as tmp_env:
-            tmp_env.write("AWS_S3_BUCKET_NAME=builder-env-bucket\n")
-            tmp_env_path = tmp_env.name
+        env_stream = io.StringIO("AWS_S3_BUCKET_NAME=builder-env-bucket\n")
         
-        try:
+        with patch.dict(os.environ, {}, clear=True):
             config = (ConfigurationBuilder()
-                     .with_env_file(tmp_env_path)
+                     .with_env_file(env_stream)
                      .for_environment("development")
                      .with_s3("override-bucket")  # Should override env file
                      .build())
-            
-            assert config.aws_s3_bucket_name == "override-bucket"  # Direct params override env file
-            assert config.environment == "development"
-        finally:
-            os.unlink(tmp_env_path)
+        
+        assert config.aws_s3_bucket_name == "override-bucket"  # Direct params override env file
+        assert config.environment == "development"
+    
+    def test_builder_can_build_again(self):
+        """Test build() leaves the builder's settings intact and builders are independent"""
+        builder = ConfigurationBuilder().for_environment("production").with_s3("reused-bucket")
+        
+        with patch.dict(os.environ, {}, clear=True):
+            first = builder.build()
+            second = builder.with_aws_region("eu-west-1").build()
+            other = ConfigurationBuilder().build()
+        
+        assert first.aws_s3_bucket_name == second.aws_s3_bucket_name == "reused-bucket"
+        assert second.environment == "production"
+        assert second.aws_region == "eu-west-1"
+        assert other.aws_s3_bucket_name is None
+    
+    def test_builder_uses_slots(self):
+        """Test builders carry no per-instance __dict__"""
+        builder = ConfigurationBuilder().with_s3("slotted-bucket")
+        
+        assert not hasattr(builder, "__dict__")
+        assert builder._config_params == {"aws_s3_bucket_name": "slotted-bucket"}
+
 
+class TestEnvFileCache:
+    """Test the parsed env file cache"""
+    
+    def test_cached_env_values_parses_once(self, tmp_path):
+        """Test an unchanged env file is parsed only once"""
+        env_path = tmp_path / "cached.env"
+        env_path.write_text("AWS_S3_BUCKET_NAME=cached-bucket\n")
+        
+        with patch('shared.config._env_cache.dotenv_values', wraps=_env_cache.dotenv_values) as mock_parse:
+            first = _env_cache.cached_env_values(env_path)
+            second = _env_cache.cached_env_values(str(env_path))
+        
+        assert first is second
+        assert first == {"AWS_S3_BUCKET_NAME": "cached-bucket"}
+        mock_parse.assert_called_once()
+    
+    def test_cached_env_values_reparses_changed_file(self, tmp_path):
+        """Test a modified env file is parsed again"""
+        env_path = tmp_path / "changed.env"
+        env_path.write_text("AWS_S3_BUCKET_NAME=old-bucket\n")
+        assert _env_cache.cached_env_values(env_path)["AWS_S3_BUCKET_NAME"] == "old-bucket"
+        
+        env_path.write_text("AWS_S3_BUCKET_NAME=new-bucket-name\n")
+        assert _env_cache.cached_env_values(env_path)["AWS_S3_BUCKET_NAME"] == "new-bucket-name"
+    
+    def test_env_file_created_after_first_load_is_found(self, tmp_path):
+        """Test a file created after another one in the same directory was loaded is found"""
+        (tmp_path / "first.env").write_text("ENVIRONMENT=first\n")
+        _env_cache.cached_env_values(tmp_path / "first.env")
+        
+        (tmp_path / "second.env").write_text("ENVIRONMENT=second\n")
+        
+        assert _env_cache.cached_env_values(tmp_path / "second.env") == {"ENVIRONMENT": "second"}
+    
+    def test_cached_env_values_missing_file(self):
+        """Test a missing env file raises FileNotFoundError"""
+        with pytest.raises(FileNotFoundError):
+            _env_cache.cached_env_values("/non/existent/file.env")
+    
+    def test_load_env_file_does_not_override(self, tmp_path):
+        """Test loading an env file keeps variables that are already set"""
+        env_path = tmp_path / "override.env"
+        env_path.write_text("ENVIRONMENT=from-file\nLOG_LEVEL=DEBUG\n")
+        
+        with patch.dict(os.environ, {"ENVIRONMENT": "from-env"}, clear=True):
+            _env_cache.load_env_file(env_path)
+            
+            assert os.environ["ENVIRONMENT"] == "from-env"
+            assert os.environ["LOG_LEVEL"] == "DEBUG"
 
 class TestConfigurationCompatibility:
     """Test backward compatibility"""
@@ -1,13 +1,21 @@
 """
 Tests for Base Repository module
 """
+import itertools
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4, UUID
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from shared.database.base import BaseTable
 from shared.database.repository import BaseRepository
 
+# Test ids are drawn from a pool generated once at import
+_UUID_POOL = [uuid4() for _ in range(256)]
+_uid_iter = itertools.cycle(_UUID_POOL)
+
 
 class TestBaseRepository:
     """Test the BaseRepository class"""
@@ -27,12 +35,19 @@ class TestBaseRepository:
         model.organization_id = MagicMock()
         return model
     
+    @pytest.fixture(autouse=True)
+    def _patch_sql(self, monkeypatch):
+        """Replace the SQL statement constructors for every test in the class"""
+        for name in ("select", "insert", "update", "delete"):
+            stub = MagicMock()
+            monkeypatch.setattr(f"shared.database.repository.{name}", stub)
+            setattr(self, f"mock_{name}", stub)
+    
     @pytest.fixture
     def repository(self, mock_session, mock_model_class):
         """Create a BaseRepository instance"""
         return BaseRepository(mock_session, mock_model_class)
     
-    @pytest.mark.asyncio
     async def test_create_success(self, repository, mock_session, mock_model_class):
         """Test successful record creation"""
         test_data = {"name": "Test Item", "description": "Test Description"}
@@ -41,23 +56,42 @@ class TestBaseRepository:
         
         result = await repository.create(**test_data)
         
-        # Verify model instance was created with correct data
+        # Verify the instance went through the model constructor
         mock_model_class.assert_called_once_with(**test_data)
+        self.mock_insert.assert_not_called()
         
         # Verify session operations
         mock_session.add.assert_called_once_with(mock_instance)
         mock_session.flush.assert_called_once()
-        mock_session.refresh.assert_called_once_with(mock_instance)
+        mock_session.refresh.assert_not_called()
         
         assert result == mock_instance
     
-    @pytest.mark.asyncio
-    @patch('shared.database.repository.select')
-    async def test_get_by_id_found(self, mock_select, repository, mock_session, mock_model_class):
+    async def test_bulk_create_batches(self, repository, mock_session, mock_model_class):
+        """Test bulk_create issues one INSERT per chunk of rows"""
+        rows = [{"name": f"Item {i}"} for i in range(5)]
+        
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.side_effect = [["r0", "r1"], ["r2", "r3"], ["r4"]]
+        mock_session.execute.return_value = mock_result
+        
+        result = await repository.bulk_create(rows, chunk_size=2)
+        
+        assert result == ["r0", "r1", "r2", "r3", "r4"]
+        assert mock_session.execute.call_count == 3
+        chunks = [call.args[0] for call in self.mock_insert.return_value.values.call_args_list]
+        assert chunks == [rows[0:2], rows[2:4], rows[4:5]]
+    
+    async def test_bulk_create_empty(self, repository, mock_session):
+        """Test bulk_create with no rows does not hit the database"""
+        assert await repository.bulk_create([]) == []
+        mock_session.execute.assert_not_called()
+    
+    async def test_get_by_id_found(self, repository, mock_session, mock_model_class):
         """Test getting record by ID when found"""
-        test_id = uuid4()
+        test_id = next(_uid_iter)
         mock_stmt = MagicMock()
-        mock_select.return_value.where.return_value = mock_stmt
+        self.mock_select.return_value.where.return_value = mock_stmt
         
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = "found_record"
@@ -68,13 +102,11 @@ class TestBaseRepository:
         assert result == "found_record"
         mock_session.execute.assert_called_once()
     
-    @pytest.mark.asyncio
-    @patch('shared.database.repository.select')
-    async def test_get_by_id_not_found(self, mock_select, repository, mock_session, mock_model_class):
+    async def test_get_by_id_not_found(self, repository, mock_session, mock_model_class):
         """Test getting record by ID when not found"""
-        test_id = uuid4()
+        test_id = next(_uid_iter)
         mock_stmt = MagicMock()
-        mock_select.return_value.where.return_value = mock_stmt
+        self.mock_select.return_value.where.return_value = mock_stmt
         
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = None
@@ -85,12 +117,50 @@ class TestBaseRepository:
         assert result is None
         mock_session.execute.assert_called_once()
     
-    @pytest.mark.asyncio
-    @patch('shared.database.repository.select')
-    async def test_get_all_basic(self, mock_select, repository, mock_session, mock_model_class):
+    async def test_exists_true(self, repository, mock_session, mock_model_class):
+        """Test exists when a row matches"""
+        test_id = next(_uid_iter)
+        mock_stmt = MagicMock()
+        self.mock_select.return_value.where.return_value.limit.return_value = mock_stmt
+        
+        mock_result = MagicMock()
+        mock_result.scalar.return_value = 1
+        mock_session.execute.return_value = mock_result
+        
+        assert await repository.exists(test_id) is True
+        self.mock_select.return_value.where.return_value.limit.assert_called_once_with(1)
+        mock_session.execute.assert_called_once_with(mock_stmt, {"id": test_id})
+    
+    async def test_exists_false(self, repository, mock_session, mock_model_class):
+        """Test exists when no row matches"""
+        test_id = next(_uid_iter)
+        self.mock_select.return_value.where.return_value.limit.return_value = MagicMock()
+        
+        mock_result = MagicMock()
+        mock_result.scalar.return_value = None
+        mock_session.execute.return_value = mock_result
+        
+        assert await repository.exists(test_id) is False
+        self.mock_select.return_value.where.return_value.limit.assert_called_once_with(1)
+    
+    async def test_get_by_id_statement_built_once_per_model(self, repository, mock_session, mock_model_class):
+        """Test the get_by_id statement is built once and the id is bound per call"""
+        mock_stmt = MagicMock()
+        self.mock_select.return_value.where.return_value = mock_stmt
+        mock_session.execute.return_value = MagicMock()
+        first_id, second_id = next(_uid_iter), next(_uid_iter)
+        
+        await repository.get_by_id(first_id)
+        await repository.get_by_id(second_id)
+        
+        self.mock_select.assert_called_once_with(mock_model_class)
+        assert mock_session.execute.call_args_list[0].args == (mock_stmt, {"id": first_id})
+        assert mock_session.execute.call_args_list[1].args == (mock_stmt, {"id": second_id})
+    
+    async def test_get_all_basic(self, repository, mock_session, mock_model_class):
         """Test getting all records without pagination"""
         mock_stmt = MagicMock()
-        mock_select.return_value.order_by.return_value = mock_stmt
+        self.mock_select.return_value.order_by.return_value = mock_stmt
         
         mock_scalars = MagicMock()
         mock_scalars.all.return_value = ["record1", "record2", "record3"]
@@ -103,12 +173,10 @@ class TestBaseRepository:
         assert result == ["record1", "record2", "record3"]
         mock_session.execute.assert_called_once()
     
-    @pytest.mark.asyncio
-    @patch('shared.database.repository.select')
-    async def test_get_all_with_pagination(self, mock_select, repository, mock_session, mock_model_class):
+    async def test_get_all_with_pagination(self, repository, mock_session, mock_model_class):
         """Test getting all records with pagination"""
         mock_stmt = MagicMock()
-        mock_select.return_value.order_by.return_value.offset.return_value.limit.return_value = mock_stmt
+        self.mock_select.return_value.order_by.return_value.offset.return_value.limit.return_value = mock_stmt
         
         mock_scalars = MagicMock()
         mock_scalars.all.return_value = ["record1", "record2"]
@@ -121,13 +189,43 @@ class TestBaseRepository:
         assert result == ["record1", "record2"]
         mock_session.execute.assert_called_once()
     
-    @pytest.mark.asyncio
-    @patch('shared.database.repository.select')
-    async def test_get_by_organization_success(self, mock_select, repository, mock_session, mock_model_class):
+    @patch('shared.database.repository.selectinload')
+    async def test_get_all_with_eager(self, mock_selectinload, repository, mock_session, mock_model_class):
+        """Test get_all adds one selectinload option per listed relationship"""
+        base_stmt = self.mock_select.return_value.order_by.return_value
+        mock_session.execute.return_value = MagicMock()
+        
+        await repository.get_all(eager=("members", "owner"))
+        
+        assert mock_selectinload.call_count == 2
+        mock_selectinload.assert_any_call(mock_model_class.members)
+        mock_selectinload.assert_any_call(mock_model_class.owner)
+        base_stmt.options.assert_called_once()
+        mock_session.execute.assert_called_once_with(base_stmt.options.return_value.options.return_value)
+    
+    async def test_iter_all_streams(self, repository, mock_session, mock_model_class):
+        """Test iter_all streams rows through stream_scalars instead of execute"""
+        mock_stmt = MagicMock()
+        self.mock_select.return_value.order_by.return_value.execution_options.return_value = mock_stmt
+        
+        async def rows():
+            for row in ["record1", "record2", "record3"]:
+                yield row
+        
+        mock_session.stream_scalars.return_value = rows()
+        
+        result = [row async for row in repository.iter_all(chunk_size=2)]
+        
+        assert result == ["record1", "record2", "record3"]
+        self.mock_select.return_value.order_by.return_value.execution_options.assert_called_once_with(yield_per=2)
+        mock_session.stream_scalars.assert_awaited_once_with(mock_stmt)
+        mock_session.execute.assert_not_called()
+    
+    async def test_get_by_organization_success(self, repository, mock_session, mock_model_class):
         """Test getting records by organization"""
-        test_org_id = uuid4()
+        test_org_id = next(_uid_iter)
         mock_stmt = MagicMock()
-        mock_select.return_value.where.return_value = mock_stmt
+        self.mock_select.return_value.where.return_value = mock_stmt
         
         mock_scalars = MagicMock()
         mock_scalars.all.return_value = ["org_record1", "org_record2"]
@@ -140,8 +238,7 @@ class TestBaseRepository:
         assert result == ["org_record1", "org_record2"]
         mock_session.execute.assert_called_once()
     
-    @pytest.mark.asyncio
-    async def test_get_by_organization_not_multitenant(self, repository, mock_session):
+    async def test_get_by_organization_not_multitenant(self, mock_session):
         """Test getting records by organization when model is not multi-tenant"""
         # Create a model without organization_id
         non_tenant_model = MagicMock()
@@ -149,21 +246,44 @@ class TestBaseRepository:
         # Remove organization_id attribute
         if hasattr(non_tenant_model, 'organization_id'):
             delattr(non_tenant_model, 'organization_id')
-        repository.model_class = non_tenant_model
+        repository = BaseRepository(mock_session, non_tenant_model)
         
-        test_org_id = uuid4()
+        test_org_id = next(_uid_iter)
         
         with pytest.raises(AttributeError):
             await repository.get_by_organization(test_org_id)
+        mock_session.execute.assert_not_called()
+    
+    async def test_multitenancy_detected_at_construction(self, mock_session):
+        """Test multi-tenancy is decided in __init__, not re-checked per call"""
+        class NonTenantModel:
+            id = MagicMock()
+        
+        repository = BaseRepository(mock_session, NonTenantModel)
+        
+        # Adding the column afterwards does not change the construction-time decision
+        NonTenantModel.organization_id = MagicMock()
+        
+        with pytest.raises(AttributeError):
+            await repository.get_by_organization(next(_uid_iter))
+        mock_session.execute.assert_not_called()
     
-    @pytest.mark.asyncio
-    @patch('shared.database.repository.update')
-    async def test_update_success(self, mock_update, repository, mock_session, mock_model_class):
+    async def test_org_stmt_built_once(self, repository, mock_session, mock_model_class):
+        """Test the organization query is built once and reused across calls"""
+        mock_session.execute.return_value = MagicMock()
+        
+        await repository.get_by_organization(next(_uid_iter))
+        await repository.get_by_organization(next(_uid_iter))
+        
+        self.mock_select.assert_called_once_with(mock_model_class)
+        assert mock_session.execute.call_count == 2
+    
+    async def test_update_success(self, repository, mock_session, mock_model_class):
         """Test successful record update"""
-        test_id = uuid4()
+        test_id = next(_uid_iter)
         test_data = {"name": "Updated Name"}
         mock_stmt = MagicMock()
-        mock_update.return_value.where.return_value.values.return_value.returning.return_value = mock_stmt
+        self.mock_update.return_value.where.return_value.values.return_value.returning.return_value = mock_stmt
         
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = "updated_record"
@@ -174,14 +294,12 @@ class TestBaseRepository:
         assert result == "updated_record"
         mock_session.execute.assert_called_once()
     
-    @pytest.mark.asyncio
-    @patch('shared.database.repository.update')
-    async def test_update_not_found(self, mock_update, repository, mock_session, mock_model_class):
+    async def test_update_not_found(self, repository, mock_session, mock_model_class):
         """Test updating non-existent record"""
-        test_id = uuid4()
+        test_id = next(_uid_iter)
         test_data = {"name": "Updated Name"}
         mock_stmt = MagicMock()
-        mock_update.return_value.where.return_value.values.return_value.returning.return_value = mock_stmt
+        self.mock_update.return_value.where.return_value.values.return_value.returning.return_value = mock_stmt
         
         mock_result = MagicMock()
         mock_result.scalar_one_or_none.return_value = None
@@ -192,13 +310,11 @@ class TestBaseRepository:
         assert result is None
         mock_session.execute.assert_called_once()
     
-    @pytest.mark.asyncio
-    @patch('shared.database.repository.delete')
-    async def test_delete_success(self, mock_delete, repository, mock_session, mock_model_class):
+    async def test_delete_success(self, repository, mock_session, mock_model_class):
         """Test successful record deletion"""
-        test_id = uuid4()
+        test_id = next(_uid_iter)
         mock_stmt = MagicMock()
-        mock_delete.return_value.where.return_value = mock_stmt
+        self.mock_delete.return_value.where.return_value = mock_stmt
         
         mock_result = MagicMock()
         mock_result.rowcount = 1
@@ -209,13 +325,11 @@ class TestBaseRepository:
         assert result is True
         mock_session.execute.assert_called_once()
     
-    @pytest.mark.asyncio
-    @patch('shared.database.repository.delete')
-    async def test_delete_not_found(self, mock_delete, repository, mock_session, mock_model_class):
+    async def test_delete_not_found(self, repository, mock_session, mock_model_class):
         """Test deleting non-existent record"""
-        test_id = uuid4()
+        test_id = next(_uid_iter)
         mock_stmt = MagicMock()
-        mock_delete.return_value.where.return_value = mock_stmt
+        self.mock_delete.return_value.where.return_value = mock_stmt
         
         mock_result = MagicMock()
         mock_result.rowcount = 0
@@ -226,12 +340,10 @@ class TestBaseRepository:
         assert result is False
         mock_session.execute.assert_called_once()
     
-    @pytest.mark.asyncio
-    @patch('shared.database.repository.select')
-    async def test_count(self, mock_select, repository, mock_session, mock_model_class):
+    async def test_count(self, repository, mock_session, mock_model_class):
         """Test counting records"""
         mock_stmt = MagicMock()
-        mock_select.return_value = mock_stmt
+        self.mock_select.return_value = mock_stmt
         
         mock_result = MagicMock()
         mock_result.scalar_one.return_value = 42
@@ -242,9 +354,61 @@ class TestBaseRepository:
         assert result == 42
         mock_session.execute.assert_called_once()
     
+    @patch('shared.database.repository.func')
+    async def test_count_uses_func_count(self, mock_func, repository, mock_session, mock_model_class):
+        """Test count issues SELECT count(*) FROM <model> rather than counting a column"""
+        mock_session.execute.return_value = MagicMock()
+        
+        await repository.count()
+        
+        mock_func.count.assert_called_once_with()
+        self.mock_select.assert_called_once_with(mock_func.count.return_value)
+        self.mock_select.return_value.select_from.assert_called_once_with(mock_model_class)
+        mock_session.execute.assert_called_once_with(self.mock_select.return_value.select_from.return_value)
+    
     def test_repository_initialization(self, mock_session, mock_model_class):
         """Test repository initialization"""
         repo = BaseRepository(mock_session, mock_model_class)
         
         assert repo.session == mock_session
-        assert repo.model_class == mock_model_class 
\ No newline at end of file
+        assert repo.model_class == mock_model_class 
+
+class _SQLiteBase(DeclarativeBase):
+    pass
+
+
+class _Widget(_SQLiteBase, BaseTable):
+    __tablename__ = "widgets"
+
+    name: Mapped[str] = mapped_column(String(50))
+
+
+class TestBaseRepositorySQLite:
+    """Exercise BaseRepository against a real in-memory SQLite session"""
+
+    @pytest.fixture
+    async def session(self):
+        """Create an AsyncSession bound to a fresh in-memory database"""
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(_SQLiteBase.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            yield session
+        await engine.dispose()
+
+    async def test_delete_evicts_loaded_instance(self, session):
+        """Test delete removes an already-loaded instance from the identity map"""
+        repo = BaseRepository(session, _Widget)
+        widget = await repo.create(name="gear")
+        assert await session.get(_Widget, widget.id) is widget
+
+        assert await repo.delete(widget.id) is True
+
+        assert await session.get(_Widget, widget.id) is None
+        assert await repo.get_by_id(widget.id) is None
+
+    async def test_delete_not_found(self, session):
+        """Test deleting a missing id reports False"""
+        repo = BaseRepository(session, _Widget)
+
+        assert await repo.delete(uuid4()) is False
@@ -1,15 +1,74 @@
 """
 Tests for S3 Storage module
 """
+import dataclasses
 import pytest
-import os
-import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest.mock import patch, Mock, MagicMock, mock_open
+from unittest.mock import patch, Mock
 from io import BytesIO
+from types import SimpleNamespace
+from botocore import UNSIGNED
 from botocore.exceptions import ClientError, NoCredentialsError
 from shared.storage.s3_client import S3Client, S3Config, get_s3_client, upload_file_to_s3, download_file_from_s3
-from shared.config.base_config import SharedInfrastructureConfig
+from shared.config.base_config import SharedInfrastructureConfig, reset_global_config
+
+# Keep this module on one xdist worker under --dist loadgroup so its module-scoped fixtures are built once
+pytestmark = pytest.mark.xdist_group("s3")
+
+# Shared error responses for the boto client mocks (only raised, never mutated)
+_ERR_ACCESS_DENIED = ClientError({"Error": {"Code": "AccessDenied", "Message": "Access Denied"}}, "op")
+_ERR_404 = ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "op")
+_ERR_NOSUCHKEY = ClientError({"Error": {"Code": "NoSuchKey", "Message": "The specified key does not exist"}}, "op")
+
+
+# The boto S3 operations S3Client uses; the mock client rejects anything else
+_BOTO_S3_METHODS = [
+    "copy", "delete_object", "download_file", "download_fileobj",
+    "generate_presigned_url", "get_object", "head_object", "list_objects_v2",
+    "upload_file", "upload_fileobj",
+]
+
+
+@pytest.fixture(scope="module")
+def _s3_mock_graph():
+    return SimpleNamespace(session=Mock(), client=Mock(spec_set=_BOTO_S3_METHODS))
+
+
+@pytest.fixture
+def mocked_s3(mocker, _s3_mock_graph):
+    """Patch boto3.Session so S3Client gets a Mock boto client; returns (boto client, Session mock)
+
+    The mocks are shared across the module and reset (calls, return values and
+    side effects) before each test instead of being rebuilt.
+    """
+    graph = _s3_mock_graph
+    graph.session.reset_mock(return_value=True, side_effect=True)
+    graph.client.reset_mock(return_value=True, side_effect=True)
+    graph.session.return_value.client.return_value = graph.client
+    mocker.patch('shared.storage.s3_client.boto3.Session', graph.session)
+    return graph.client, graph.session
+
+
+@pytest.fixture(scope="class")
+def _test_bucket_client():
+    return S3Client(S3Config(bucket_name="test-bucket"))
+
+
+@pytest.fixture
+def s3_client(_test_bucket_client):
+    """S3Client for "test-bucket", shared by a test class; the boto client is fetched afresh per test"""
+    _test_bucket_client._client = None
+    _test_bucket_client._session = None
+    return _test_bucket_client
+
+
+@pytest.fixture
+def fake_upload_path():
+    """A path that upload_file sees as existing; the boto client is mocked so it is never read"""
+    with patch.object(Path, "exists", return_value=True):
+        yield "/fake/path.txt"
 
 
 class TestS3Config:
@@ -46,8 +105,20 @@ class TestS3Config:
         assert config.endpoint_url is None
         assert config.use_ssl is True
         assert config.signature_version == "s3v4"
+        assert config.multipart_threshold == 100 * 1024 * 1024
+        assert config.max_concurrency == 10
+    
+    def test_s3_config_frozen_and_hashable(self):
+        """Test S3Config is immutable and can be used as a cache key"""
+        config = S3Config(bucket_name="test-bucket", region="us-west-2")
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.bucket_name = "other-bucket"
+        assert hash(config) == hash(S3Config(bucket_name="test-bucket", region="us-west-2"))
+        assert {config: "cached"}[S3Config(bucket_name="test-bucket", region="us-west-2")] == "cached"
+        assert dataclasses.replace(config, bucket_name="other-bucket").bucket_name == "other-bucket"
     
-    def test_s3_config_from_shared_config(self):
+    def test_s3_config_from_shared_config(self, config_factory):
         """Test S3Config.from_shared_config method"""
         test_env = {
             "AWS_S3_BUCKET_NAME": "wekare-test-bucket",
@@ -59,19 +130,18 @@ class TestS3Config:
             "AWS_S3_SIGNATURE_VERSION": "s3v2"
         }
         
-        with patch.dict(os.environ, test_env):
-            shared_config = SharedInfrastructureConfig()
-            s3_config = S3Config.from_shared_config(shared_config)
-            
-            assert s3_config.bucket_name == "wekare-test-bucket"
-            assert s3_config.region == "us-west-1"
-            assert s3_config.access_key_id == "test-access-key"
-            assert s3_config.secret_access_key == "test-secret-key"
-            assert s3_config.endpoint_url == "http://localstack:4566"
-            assert s3_config.use_ssl is False
-            assert s3_config.signature_version == "s3v2"
-    
-    def test_s3_config_from_shared_config_with_fallback_region(self):
+        shared_config = config_factory(test_env)
+        s3_config = S3Config.from_shared_config(shared_config)
+        
+        assert s3_config.bucket_name == "wekare-test-bucket"
+        assert s3_config.region == "us-west-1"
+        assert s3_config.access_key_id == "test-access-key"
+        assert s3_config.secret_access_key == "test-secret-key"
+        assert s3_config.endpoint_url == "http://localstack:4566"
+        assert s3_config.use_ssl is False
+        assert s3_config.signature_version == "s3v2"
+    
+    def test_s3_config_from_shared_config_with_fallback_region(self, config_factory):
         """Test S3Config falls back to aws_region when aws_s3_region is not set"""
         test_env = {
             "AWS_S3_BUCKET_NAME": "wekare-test-bucket",
@@ -80,39 +150,32 @@ class TestS3Config:
             "AWS_SECRET_ACCESS_KEY": "test-secret-key"
         }
         
-        with patch.dict(os.environ, test_env):
-            shared_config = SharedInfrastructureConfig()
-            s3_config = S3Config.from_shared_config(shared_config)
-            
-            assert s3_config.bucket_name == "wekare-test-bucket"
-            assert s3_config.region == "us-east-1"  # Should use aws_region
+        shared_config = config_factory(test_env)
+        s3_config = S3Config.from_shared_config(shared_config)
+        
+        assert s3_config.bucket_name == "wekare-test-bucket"
+        assert s3_config.region == "us-east-1"  # Should use aws_region
     
-    def test_s3_config_from_shared_config_missing_bucket(self):
+    def test_s3_config_from_shared_config_missing_bucket(self, monkeypatch):
         """Test S3Config.from_shared_config raises error when bucket name is missing"""
-        test_env = {
-            "AWS_REGION": "us-east-1"
-        }
+        monkeypatch.setenv("AWS_REGION", "us-east-1")
+        shared_config = SharedInfrastructureConfig()
         
-        with patch.dict(os.environ, test_env):
-            shared_config = SharedInfrastructureConfig()
-            
-            with pytest.raises(ValueError, match="aws_s3_bucket_name must be configured"):
-                S3Config.from_shared_config(shared_config)
+        with pytest.raises(ValueError, match="aws_s3_bucket_name must be configured"):
+            S3Config.from_shared_config(shared_config)
     
-    def test_s3_config_from_shared_config_none_parameter(self):
+    def test_s3_config_from_shared_config_none_parameter(self, config_factory):
         """Test S3Config.from_shared_config with None parameter"""
         test_env = {
             "AWS_S3_BUCKET_NAME": "wekare-test-bucket",
             "AWS_REGION": "us-east-1"
         }
         
-        with patch.dict(os.environ, test_env):
-            # Create a new config instance to pick up the patched environment
-            shared_config = SharedInfrastructureConfig()
-            s3_config = S3Config.from_shared_config(shared_config)
-            
-            assert s3_config.bucket_name == "wekare-test-bucket"
-            assert s3_config.region == "us-east-1"
+        shared_config = config_factory(test_env)
+        s3_config = S3Config.from_shared_config(shared_config)
+        
+        assert s3_config.bucket_name == "wekare-test-bucket"
+        assert s3_config.region == "us-east-1"
 
 
 class TestS3Client:
@@ -127,42 +190,25 @@ class TestS3Client:
         assert client.config.region == "us-west-2"
         assert client._client is None  # Should be lazy loaded
     
-    def test_s3_client_initialization_with_shared_config(self):
-        """Test S3Client initialization with SharedInfrastructureConfig"""
-        test_env = {
-            "AWS_S3_BUCKET_NAME": "wekare-test-bucket",
-            "AWS_REGION": "us-east-1"
-        }
+    @pytest.mark.parametrize("use_global", [False, True], ids=["explicit-config", "global-config"])
+    def test_s3_client_initialization_from_env(self, monkeypatch, use_global):
+        """Test S3Client picks up env settings from an explicit or the global shared config"""
+        monkeypatch.setenv("AWS_S3_BUCKET_NAME", "wekare-test-bucket")
+        monkeypatch.setenv("AWS_REGION", "us-east-1")
         
-        with patch.dict(os.environ, test_env):
-            shared_config = SharedInfrastructureConfig()
-            client = S3Client(shared_config)
-            
-            assert client.config.bucket_name == "wekare-test-bucket"
-            assert client.config.region == "us-east-1"
-    
-    def test_s3_client_initialization_with_none(self):
-        """Test S3Client initialization with None (should use global config)"""
-        test_env = {
-            "AWS_S3_BUCKET_NAME": "wekare-test-bucket",
-            "AWS_REGION": "us-east-1"
-        }
+        reset_global_config()
+        try:
+            client = S3Client(None if use_global else SharedInfrastructureConfig())
+        finally:
+            reset_global_config()
         
-        with patch.dict(os.environ, test_env):
-            # Create a new config instance to pick up the patched environment
-            shared_config = SharedInfrastructureConfig()
-            client = S3Client(shared_config)
-            
-            assert client.config.bucket_name == "wekare-test-bucket"
-            assert client.config.region == "us-east-1"
+        assert client.config.bucket_name == "wekare-test-bucket"
+        assert client.config.region == "us-east-1"
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_create_client_with_credentials(self, mock_session):
+    def test_create_client_with_credentials(self, mocked_s3):
         """Test _create_client method with credentials"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+        mock_boto_client, mock_session = mocked_s3
+        mock_session_instance = mock_session.return_value
         
         config = S3Config(
             bucket_name="test-bucket",
@@ -186,13 +232,10 @@ class TestS3Client:
         mock_session_instance.client.assert_called_once()
         assert boto_client == mock_boto_client
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_create_client_with_endpoint_url(self, mock_session):
+    def test_create_client_with_endpoint_url(self, mocked_s3):
         """Test _create_client method with custom endpoint URL"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+        _, mock_session = mocked_s3
+        mock_session_instance = mock_session.return_value
         
         config = S3Config(
             bucket_name="test-bucket",
@@ -208,9 +251,20 @@ class TestS3Client:
         call_args = mock_session_instance.client.call_args
         assert call_args[1]["endpoint_url"] == "http://localhost:9000"
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_create_client_no_credentials_error(self, mock_session):
+    def test_create_client_shared_across_instances(self, mocked_s3):
+        """Test S3Clients with the same connection settings share one boto3 client"""
+        _, mock_session = mocked_s3
+        first = S3Client(S3Config(bucket_name="bucket-a", region="us-west-2")).client
+        second = S3Client(S3Config(bucket_name="bucket-b", region="us-west-2")).client
+        S3Client(S3Config(bucket_name="bucket-a", region="eu-west-1")).client
+        
+        assert first is second
+        # One session for us-west-2, one for eu-west-1
+        assert mock_session.call_count == 2
+    
+    def test_create_client_no_credentials_error(self, mocked_s3):
         """Test _create_client method with NoCredentialsError"""
+        _, mock_session = mocked_s3
         mock_session.side_effect = NoCredentialsError()
         
         config = S3Config(bucket_name="test-bucket")
@@ -219,149 +273,128 @@ class TestS3Client:
         with pytest.raises(ValueError, match="AWS credentials not configured"):
             _ = client.client
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_create_client_general_error(self, mock_session):
-        """Test _create_client method with general error"""
-        mock_session.side_effect = Exception("Connection failed")
+    def test_create_client_resolves_credentials_eagerly(self, mocked_s3):
+        """Test _create_client resolves credentials once at client creation"""
+        _, mock_session = mocked_s3
+        mock_session_instance = mock_session.return_value
         
         config = S3Config(bucket_name="test-bucket")
         client = S3Client(config)
+        _ = client.client
         
-        with pytest.raises(ValueError, match="Failed to create S3 client"):
-            _ = client.client
+        mock_session_instance.get_credentials.assert_called_once()
+        mock_session_instance.get_credentials.return_value.get_frozen_credentials.assert_called_once()
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_upload_file_success(self, mock_session):
-        """Test upload_file method success"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+    def test_create_client_missing_credentials(self, mocked_s3):
+        """Test _create_client fails fast when no credentials can be resolved"""
+        _, mock_session = mocked_s3
+        mock_session_instance = mock_session.return_value
+        mock_session_instance.get_credentials.return_value = None
         
         config = S3Config(bucket_name="test-bucket")
         client = S3Client(config)
         
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            tmp_file.write(b"test content")
-            tmp_file_path = tmp_file.name
-        
-        try:
-            # Test successful upload
-            result = client.upload_file(tmp_file_path, "test-key")
-            
-            assert result is True
-            mock_boto_client.upload_file.assert_called_once_with(
-                tmp_file_path,
-                "test-bucket",
-                "test-key",
-                ExtraArgs=None
-            )
-        finally:
-            # Clean up
-            os.unlink(tmp_file_path)
+        with pytest.raises(ValueError, match="AWS credentials not configured"):
+            _ = client.client
+        mock_session_instance.client.assert_not_called()
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_upload_file_with_metadata(self, mock_session):
-        """Test upload_file method with metadata and content type"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+    def test_create_client_custom_endpoint_without_credentials(self, mocked_s3):
+        """Test a custom endpoint (e.g. a local emulator) allows anonymous access"""
+        _, mock_session = mocked_s3
+        mock_session_instance = mock_session.return_value
+        mock_session_instance.get_credentials.return_value = None
         
-        config = S3Config(bucket_name="test-bucket")
+        config = S3Config(bucket_name="test-bucket", endpoint_url="http://localhost:9000")
         client = S3Client(config)
         
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            tmp_file.write(b"test content")
-            tmp_file_path = tmp_file.name
+        assert client.client is mock_session_instance.client.return_value
+    
+    def test_create_client_unsigned_skips_credentials(self, mocked_s3):
+        """Test unsigned (public bucket) clients never resolve credentials"""
+        _, mock_session = mocked_s3
+        mock_session_instance = mock_session.return_value
+        mock_session_instance.get_credentials.return_value = None
         
-        try:
-            metadata = {"author": "test-user", "version": "1.0"}
-            content_type = "application/json"
-            
-            result = client.upload_file(
-                tmp_file_path, 
-                "test-key", 
-                metadata=metadata, 
-                content_type=content_type
-            )
-            
-            assert result is True
-            mock_boto_client.upload_file.assert_called_once_with(
-                tmp_file_path,
-                "test-bucket",
-                "test-key",
-                ExtraArgs={
-                    "Metadata": metadata,
-                    "ContentType": content_type
-                }
-            )
-        finally:
-            # Clean up
-            os.unlink(tmp_file_path)
+        config = S3Config(bucket_name="public-bucket", signature_version=UNSIGNED)
+        client = S3Client(config)
+        
+        assert client.client is mock_session_instance.client.return_value
+        mock_session_instance.get_credentials.assert_not_called()
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_upload_file_not_found(self, mock_session):
-        """Test upload_file method with file not found"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+    def test_create_client_general_error(self, mocked_s3):
+        """Test _create_client method with general error"""
+        _, mock_session = mocked_s3
+        mock_session.side_effect = Exception("Connection failed")
         
         config = S3Config(bucket_name="test-bucket")
         client = S3Client(config)
         
+        with pytest.raises(ValueError, match="Failed to create S3 client"):
+            _ = client.client
+    
+    @pytest.mark.parametrize("kwargs,expected_extra_args", [
+        ({}, None),
+        (
+            {"metadata": {"author": "test-user", "version": "1.0"}, "content_type": "application/json"},
+            {"Metadata": {"author": "test-user", "version": "1.0"}, "ContentType": "application/json"},
+        ),
+    ], ids=["plain", "with-metadata"])
+    def test_upload_file_success(self, mocked_s3, fake_upload_path, kwargs, expected_extra_args):
+        """Test upload_file passes metadata and content type through ExtraArgs"""
+        mock_boto_client, _ = mocked_s3
+        client = S3Client(S3Config(bucket_name="test-bucket"))
+        
+        assert client.upload_file(fake_upload_path, "test-key", **kwargs) is True
+        mock_boto_client.upload_file.assert_called_once_with(
+            fake_upload_path,
+            "test-bucket",
+            "test-key",
+            ExtraArgs=expected_extra_args
+        )
+    
+    def test_upload_file_real_path(self, mocked_s3, tmp_path):
+        """Test upload_file with a file that really exists on disk"""
+        mock_boto_client, _ = mocked_s3
+        file_path = tmp_path / "upload.txt"
+        file_path.touch()  # upload_file only checks the path exists; boto is mocked
+        
+        client = S3Client(S3Config(bucket_name="test-bucket"))
+        
+        assert client.upload_file(file_path, "test-key") is True
+        mock_boto_client.upload_file.assert_called_once_with(
+            str(file_path),
+            "test-bucket",
+            "test-key",
+            ExtraArgs=None
+        )
+    
+    def test_upload_file_not_found(self, mocked_s3, s3_client):
+        """Test upload_file method with file not found"""
+        mock_boto_client, _ = mocked_s3
+        
         # Test with non-existent file
-        result = client.upload_file("/non/existent/file.txt", "test-key")
+        result = s3_client.upload_file("/non/existent/file.txt", "test-key")
         
         assert result is False
         mock_boto_client.upload_file.assert_not_called()
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_upload_file_client_error(self, mock_session):
+    def test_upload_file_client_error(self, mocked_s3, fake_upload_path, s3_client):
         """Test upload_file method with ClientError"""
-        mock_boto_client = Mock()
-        mock_boto_client.upload_file.side_effect = ClientError(
-            {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}},
-            "upload_file"
-        )
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
-        
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
+        mock_boto_client, _ = mocked_s3
+        mock_boto_client.upload_file.side_effect = _ERR_ACCESS_DENIED
         
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            tmp_file.write(b"test content")
-            tmp_file_path = tmp_file.name
+        result = s3_client.upload_file(fake_upload_path, "test-key")
         
-        try:
-            result = client.upload_file(tmp_file_path, "test-key")
-            
-            assert result is False
-            mock_boto_client.upload_file.assert_called_once()
-        finally:
-            # Clean up
-            os.unlink(tmp_file_path)
+        assert result is False
+        mock_boto_client.upload_file.assert_called_once()
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_upload_fileobj_success(self, mock_session):
+    def test_upload_fileobj_success(self, mocked_s3, s3_client):
         """Test upload_fileobj method success"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
-        
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
+        mock_boto_client, _ = mocked_s3
         
         file_obj = BytesIO(b"test content")
         
-        result = client.upload_fileobj(file_obj, "test-key")
+        result = s3_client.upload_fileobj(file_obj, "test-key")
         
         assert result is True
         mock_boto_client.upload_fileobj.assert_called_once_with(
@@ -371,65 +404,37 @@ class TestS3Client:
             ExtraArgs=None
         )
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_download_file_success(self, mock_session):
+    def test_download_file_success(self, mocked_s3, tmp_path, s3_client):
         """Test download_file method success"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+        mock_boto_client, _ = mocked_s3
         
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
+        download_path = tmp_path / "downloaded_file.txt"
         
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            download_path = Path(tmp_dir) / "downloaded_file.txt"
-            
-            result = client.download_file("test-key", download_path)
-            
-            assert result is True
-            mock_boto_client.download_file.assert_called_once_with(
-                "test-bucket",
-                "test-key",
-                str(download_path)
-            )
-    
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_download_file_not_found(self, mock_session):
-        """Test download_file method with file not found"""
-        mock_boto_client = Mock()
-        mock_boto_client.download_file.side_effect = ClientError(
-            {"Error": {"Code": "404", "Message": "Not Found"}},
-            "download_file"
+        result = s3_client.download_file("test-key", download_path)
+        
+        assert result is True
+        mock_boto_client.download_file.assert_called_once_with(
+            "test-bucket",
+            "test-key",
+            str(download_path)
         )
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+    
+    def test_download_file_not_found(self, mocked_s3, tmp_path, s3_client):
+        """Test download_file method with file not found"""
+        mock_boto_client, _ = mocked_s3
+        mock_boto_client.download_file.side_effect = _ERR_404
         
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
+        result = s3_client.download_file("test-key", tmp_path / "downloaded_file.txt")
         
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            download_path = Path(tmp_dir) / "downloaded_file.txt"
-            
-            result = client.download_file("test-key", download_path)
-            
-            assert result is False
+        assert result is False
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_download_fileobj_success(self, mock_session):
+    def test_download_fileobj_success(self, mocked_s3, s3_client):
         """Test download_fileobj method success"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
-        
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
+        mock_boto_client, _ = mocked_s3
         
         file_obj = BytesIO()
         
-        result = client.download_fileobj("test-key", file_obj)
+        result = s3_client.download_fileobj("test-key", file_obj)
         
         assert result is True
         mock_boto_client.download_fileobj.assert_called_once_with(
@@ -438,29 +443,20 @@ class TestS3Client:
             file_obj
         )
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_get_object_success(self, mock_session):
+    def test_get_object_success(self, mocked_s3, s3_client):
         """Test get_object method success"""
-        mock_boto_client = Mock()
+        mock_boto_client, _ = mocked_s3
         mock_response = {
-            "Body": Mock(),
+            "Body": BytesIO(b"test content"),  # stands in for botocore's StreamingBody
             "ContentType": "text/plain",
             "ContentLength": 12,
             "LastModified": "2024-01-01T00:00:00Z",
             "Metadata": {"author": "test-user"},
             "ETag": "\"abc123\""
         }
-        mock_response["Body"].read.return_value = b"test content"
         mock_boto_client.get_object.return_value = mock_response
         
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
-        
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
-        
-        result = client.get_object("test-key")
+        result = s3_client.get_object("test-key")
         
         assert result is not None
         assert result["Body"] == b"test content"
@@ -469,37 +465,20 @@ class TestS3Client:
         assert result["Metadata"]["author"] == "test-user"
         assert result["ETag"] == "\"abc123\""
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_get_object_not_found(self, mock_session):
+    def test_get_object_not_found(self, mocked_s3, s3_client):
         """Test get_object method with object not found"""
-        mock_boto_client = Mock()
-        mock_boto_client.get_object.side_effect = ClientError(
-            {"Error": {"Code": "NoSuchKey", "Message": "The specified key does not exist"}},
-            "get_object"
-        )
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+        mock_boto_client, _ = mocked_s3
+        mock_boto_client.get_object.side_effect = _ERR_NOSUCHKEY
         
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
-        
-        result = client.get_object("non-existent-key")
+        result = s3_client.get_object("non-existent-key")
         
         assert result is None
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_delete_object_success(self, mock_session):
+    def test_delete_object_success(self, mocked_s3, s3_client):
         """Test delete_object method success"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+        mock_boto_client, _ = mocked_s3
         
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
-        
-        result = client.delete_object("test-key")
+        result = s3_client.delete_object("test-key")
         
         assert result is True
         mock_boto_client.delete_object.assert_called_once_with(
@@ -507,29 +486,18 @@ class TestS3Client:
             Key="test-key"
         )
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_delete_object_error(self, mock_session):
+    def test_delete_object_error(self, mocked_s3, s3_client):
         """Test delete_object method with error"""
-        mock_boto_client = Mock()
-        mock_boto_client.delete_object.side_effect = ClientError(
-            {"Error": {"Code": "AccessDenied", "Message": "Access Denied"}},
-            "delete_object"
-        )
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+        mock_boto_client, _ = mocked_s3
+        mock_boto_client.delete_object.side_effect = _ERR_ACCESS_DENIED
         
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
-        
-        result = client.delete_object("test-key")
+        result = s3_client.delete_object("test-key")
         
         assert result is False
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_list_objects_success(self, mock_session):
+    def test_list_objects_success(self, mocked_s3, s3_client):
         """Test list_objects method success"""
-        mock_boto_client = Mock()
+        mock_boto_client, _ = mocked_s3
         mock_response = {
             "Contents": [
                 {
@@ -550,14 +518,8 @@ class TestS3Client:
         }
         mock_boto_client.list_objects_v2.return_value = mock_response
         
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
-        
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
         
-        result = client.list_objects(prefix="files/", max_keys=100)
+        result = s3_client.list_objects(prefix="files/", max_keys=100)
         
         assert len(result) == 2
         assert result[0]["Key"] == "file1.txt"
@@ -571,37 +533,23 @@ class TestS3Client:
             MaxKeys=100
         )
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_list_objects_empty(self, mock_session):
+    def test_list_objects_empty(self, mocked_s3, s3_client):
         """Test list_objects method with empty bucket"""
-        mock_boto_client = Mock()
+        mock_boto_client, _ = mocked_s3
         mock_boto_client.list_objects_v2.return_value = {}  # No Contents key
         
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
         
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
-        
-        result = client.list_objects()
+        result = s3_client.list_objects()
         
         assert result == []
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_object_exists_true(self, mock_session):
+    def test_object_exists_true(self, mocked_s3, s3_client):
         """Test object_exists method when object exists"""
-        mock_boto_client = Mock()
+        mock_boto_client, _ = mocked_s3
         mock_boto_client.head_object.return_value = {"ContentLength": 100}
         
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
-        
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
         
-        result = client.object_exists("test-key")
+        result = s3_client.object_exists("test-key")
         
         assert result is True
         mock_boto_client.head_object.assert_called_once_with(
@@ -609,40 +557,23 @@ class TestS3Client:
             Key="test-key"
         )
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_object_exists_false(self, mock_session):
+    def test_object_exists_false(self, mocked_s3, s3_client):
         """Test object_exists method when object doesn't exist"""
-        mock_boto_client = Mock()
-        mock_boto_client.head_object.side_effect = ClientError(
-            {"Error": {"Code": "404", "Message": "Not Found"}},
-            "head_object"
-        )
-        
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+        mock_boto_client, _ = mocked_s3
+        mock_boto_client.head_object.side_effect = _ERR_404
         
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
         
-        result = client.object_exists("test-key")
+        result = s3_client.object_exists("test-key")
         
         assert result is False
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_get_presigned_url_success(self, mock_session):
+    def test_get_presigned_url_success(self, mocked_s3, s3_client):
         """Test get_presigned_url method success"""
-        mock_boto_client = Mock()
+        mock_boto_client, _ = mocked_s3
         mock_boto_client.generate_presigned_url.return_value = "https://test-bucket.s3.amazonaws.com/test-key?signature=abc123"
         
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
         
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
-        
-        result = client.get_presigned_url("test-key", expiration=3600, http_method="GET")
+        result = s3_client.get_presigned_url("test-key", expiration=3600, http_method="GET")
         
         assert result == "https://test-bucket.s3.amazonaws.com/test-key?signature=abc123"
         mock_boto_client.generate_presigned_url.assert_called_once_with(
@@ -651,89 +582,56 @@ class TestS3Client:
             ExpiresIn=3600
         )
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_get_presigned_url_invalid_method(self, mock_session):
+    def test_get_presigned_url_invalid_method(self, mocked_s3, s3_client):
         """Test get_presigned_url method with invalid HTTP method"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
-        
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
+        mock_boto_client, _ = mocked_s3
         
-        result = client.get_presigned_url("test-key", http_method="INVALID")
+        result = s3_client.get_presigned_url("test-key", http_method="INVALID")
         
         assert result is None
         mock_boto_client.generate_presigned_url.assert_not_called()
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_copy_object_success(self, mock_session):
-        """Test copy_object method success"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
-        
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
-        
-        result = client.copy_object("source-key", "destination-key")
-        
-        assert result is True
-        mock_boto_client.copy_object.assert_called_once_with(
-            CopySource={"Bucket": "test-bucket", "Key": "source-key"},
-            Bucket="test-bucket",
-            Key="destination-key"
-        )
-    
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_copy_object_with_metadata(self, mock_session):
-        """Test copy_object method with metadata"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
-        
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
-        
-        metadata = {"version": "2.0", "author": "test-user"}
-        result = client.copy_object("source-key", "destination-key", metadata=metadata)
-        
-        assert result is True
-        mock_boto_client.copy_object.assert_called_once_with(
-            CopySource={"Bucket": "test-bucket", "Key": "source-key"},
-            Bucket="test-bucket",
-            Key="destination-key",
-            Metadata=metadata,
-            MetadataDirective="REPLACE"
-        )
-    
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_copy_object_different_source_bucket(self, mock_session):
-        """Test copy_object method with different source bucket"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
-        
-        config = S3Config(bucket_name="dest-bucket")
-        client = S3Client(config)
-        
-        result = client.copy_object("source-key", "destination-key", source_bucket="source-bucket")
-        
-        assert result is True
-        mock_boto_client.copy_object.assert_called_once_with(
-            CopySource={"Bucket": "source-bucket", "Key": "source-key"},
-            Bucket="dest-bucket",
-            Key="destination-key"
-        )
+    @pytest.mark.parametrize("bucket_name,kwargs,expected_call", [
+        (
+            "test-bucket",
+            {},
+            {"CopySource": {"Bucket": "test-bucket", "Key": "source-key"},
+             "Bucket": "test-bucket", "Key": "destination-key", "ExtraArgs": None},
+        ),
+        (
+            "test-bucket",
+            {"metadata": {"version": "2.0", "author": "test-user"}},
+            {"CopySource": {"Bucket": "test-bucket", "Key": "source-key"},
+             "Bucket": "test-bucket", "Key": "destination-key",
+             "ExtraArgs": {"Metadata": {"version": "2.0", "author": "test-user"},
+                           "MetadataDirective": "REPLACE"}},
+        ),
+        (
+            "dest-bucket",
+            {"source_bucket": "source-bucket"},
+            {"CopySource": {"Bucket": "source-bucket", "Key": "source-key"},
+             "Bucket": "dest-bucket", "Key": "destination-key", "ExtraArgs": None},
+        ),
+    ], ids=["same-bucket", "with-metadata", "different-source-bucket"])
+    def test_copy_object(self, mocked_s3, bucket_name, kwargs, expected_call):
+        """Test copy_object goes straight to the managed copy without a size probe"""
+        mock_boto_client, _ = mocked_s3
+        
+        client = S3Client(S3Config(bucket_name=bucket_name))
+        
+        assert client.copy_object("source-key", "destination-key", **kwargs) is True
+        mock_boto_client.copy.assert_called_once_with(**expected_call, Config=client._transfer_config)
+        mock_boto_client.head_object.assert_not_called()
 
 
 class TestConvenienceFunctions:
     """Test the convenience functions"""
     
+    @pytest.fixture(autouse=True)
+    def _mock_boto(self, mocked_s3):
+        """Route every test in the class through one mocked boto client"""
+        self.mock_client, _ = mocked_s3
+    
     def test_get_s3_client_with_config(self):
         """Test get_s3_client function with config"""
         config = S3Config(bucket_name="test-bucket")
@@ -742,33 +640,26 @@ class TestConvenienceFunctions:
         assert isinstance(client, S3Client)
         assert client.config.bucket_name == "test-bucket"
     
-    def test_get_s3_client_with_none(self):
+    def test_get_s3_client_with_none(self, config_factory):
         """Test get_s3_client function with None config"""
         test_env = {
             "AWS_S3_BUCKET_NAME": "wekare-test-bucket",
             "AWS_REGION": "us-east-1"
         }
         
-        with patch.dict(os.environ, test_env):
-            # Create a new config instance to pick up the patched environment
-            shared_config = SharedInfrastructureConfig()
-            client = get_s3_client(shared_config)
-            
-            assert isinstance(client, S3Client)
-            assert client.config.bucket_name == "wekare-test-bucket"
+        shared_config = config_factory(test_env)
+        client = get_s3_client(shared_config)
+        
+        assert isinstance(client, S3Client)
+        assert client.config.bucket_name == "wekare-test-bucket"
     
-    @patch('shared.storage.s3_client.S3Client')
-    def test_upload_file_to_s3_convenience(self, mock_s3_client):
+    def test_upload_file_to_s3_convenience(self, fake_upload_path):
         """Test upload_file_to_s3 convenience function"""
-        mock_client_instance = Mock()
-        mock_client_instance.upload_file.return_value = True
-        mock_s3_client.return_value = mock_client_instance
-        
         config = S3Config(bucket_name="test-bucket")
         metadata = {"author": "test-user"}
         
         result = upload_file_to_s3(
-            "/path/to/file.txt", 
+            fake_upload_path, 
             "test-key", 
             config=config, 
             metadata=metadata, 
@@ -776,94 +667,112 @@ class TestConvenienceFunctions:
         )
         
         assert result is True
-        mock_s3_client.assert_called_once_with(config)
-        mock_client_instance.upload_file.assert_called_once_with(
-            "/path/to/file.txt", 
-            "test-key", 
-            metadata, 
-            "text/plain"
+        self.mock_client.upload_file.assert_called_once_with(
+            fake_upload_path,
+            "test-bucket",
+            "test-key",
+            ExtraArgs={"Metadata": metadata, "ContentType": "text/plain"}
         )
     
-    @patch('shared.storage.s3_client.S3Client')
-    def test_download_file_from_s3_convenience(self, mock_s3_client):
+    def test_download_file_from_s3_convenience(self, tmp_path):
         """Test download_file_from_s3 convenience function"""
-        mock_client_instance = Mock()
-        mock_client_instance.download_file.return_value = True
-        mock_s3_client.return_value = mock_client_instance
-        
         config = S3Config(bucket_name="test-bucket")
+        download_path = tmp_path / "download.txt"
         
-        result = download_file_from_s3("test-key", "/path/to/download.txt", config=config)
+        result = download_file_from_s3("test-key", download_path, config=config)
         
         assert result is True
-        mock_s3_client.assert_called_once_with(config)
-        mock_client_instance.download_file.assert_called_once_with("test-key", "/path/to/download.txt")
+        self.mock_client.download_file.assert_called_once_with("test-bucket", "test-key", str(download_path))
 
 
 class TestS3IntegrationScenarios:
     """Integration-style tests for common S3 usage scenarios"""
     
-    @patch('shared.storage.s3_client.boto3.Session')
-    def test_complete_file_lifecycle(self, mock_session):
+    def test_complete_file_lifecycle(self, mocked_s3, tmp_path, s3_client):
         """Test complete file lifecycle: upload, check exists, download, delete"""
-        mock_boto_client = Mock()
-        mock_session_instance = Mock()
-        mock_session_instance.client.return_value = mock_boto_client
-        mock_session.return_value = mock_session_instance
+        mock_boto_client, _ = mocked_s3
         
         # Mock successful operations
         mock_boto_client.head_object.return_value = {"ContentLength": 100}
         
-        config = S3Config(bucket_name="test-bucket")
-        client = S3Client(config)
-        
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            tmp_file.write(b"test content")
-            tmp_file_path = tmp_file.name
-        
-        try:
-            # Upload
-            upload_result = client.upload_file(tmp_file_path, "test-key")
-            assert upload_result is True
-            
-            # Check exists
-            exists_result = client.object_exists("test-key")
-            assert exists_result is True
-            
-            # Download
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                download_path = Path(tmp_dir) / "downloaded.txt"
-                download_result = client.download_file("test-key", download_path)
-                assert download_result is True
-            
-            # Delete
-            delete_result = client.delete_object("test-key")
-            assert delete_result is True
-            
-        finally:
-            # Clean up
-            os.unlink(tmp_file_path)
-    
-    def test_configuration_precedence(self):
-        """Test that S3 configuration follows correct precedence"""
-        test_env = {
-            "AWS_S3_BUCKET_NAME": "env-bucket",
-            "AWS_S3_REGION": "us-west-2",
-            "AWS_REGION": "us-east-1",  # Should be overridden by AWS_S3_REGION
-            "AWS_ACCESS_KEY_ID": "env-key",
-            "AWS_SECRET_ACCESS_KEY": "env-secret"
-        }
-        
-        with patch.dict(os.environ, test_env):
-            shared_config = SharedInfrastructureConfig()
-            s3_config = S3Config.from_shared_config(shared_config)
-            
-            # S3-specific region should take precedence
-            assert s3_config.region == "us-west-2"
-            assert s3_config.bucket_name == "env-bucket"
-            assert s3_config.access_key_id == "env-key"
-            assert s3_config.secret_access_key == "env-secret"
+        upload_path = tmp_path / "upload.txt"
+        upload_path.touch()
+        
+        # Upload
+        upload_result = s3_client.upload_file(upload_path, "test-key")
+        assert upload_result is True
+        
+        # Check exists
+        exists_result = s3_client.object_exists("test-key")
+        assert exists_result is True
+        
+        # Download
+        download_result = s3_client.download_file("test-key", tmp_path / "downloaded.txt")
+        assert download_result is True
+        
+        # Delete
+        delete_result = s3_client.delete_object("test-key")
+        assert delete_result is True
+    
+    def test_concurrent_operations(self, mocked_s3):
+        """Test one S3Client can be shared across threads, creating the boto client once"""
+        mock_boto_client, mock_session = mocked_s3
+        seen_keys = []
+        seen_lock = threading.Lock()
+        
+        def record_head_object(Bucket, Key):
+            with seen_lock:
+                seen_keys.append(Key)
+            return {"ContentLength": 100}
+        
+        mock_boto_client.head_object.side_effect = record_head_object
+        
+        # Fresh client so the first concurrent calls race to create the boto client
+        client = S3Client(S3Config(bucket_name="test-bucket"))
+        keys = [f"k{i}" for i in range(64)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(client.object_exists, keys))
+        
+        assert results == [True] * len(keys)
+        assert sorted(seen_keys) == sorted(keys)
+        mock_session.assert_called_once()
+    
+    @pytest.mark.parametrize("env,expected", [
+        (
+            {
+                "AWS_S3_BUCKET_NAME": "env-bucket",
+                "AWS_S3_REGION": "us-west-2",
+                "AWS_REGION": "us-east-1",  # Should be overridden by AWS_S3_REGION
+                "AWS_ACCESS_KEY_ID": "env-key",
+                "AWS_SECRET_ACCESS_KEY": "env-secret"
+            },
+            {
+                "region": "us-west-2",
+                "bucket_name": "env-bucket",
+                "access_key_id": "env-key",
+                "secret_access_key": "env-secret"
+            },
+        ),
+        (
+            {
+                "AWS_S3_BUCKET_NAME": "env-bucket",
+                "AWS_S3_REGION": None,
+                "AWS_REGION": "eu-central-1",
+            },
+            {"region": "eu-central-1", "bucket_name": "env-bucket"},
+        ),
+    ], ids=["s3-region-wins", "falls-back-to-aws-region"])
+    def test_configuration_precedence(self, monkeypatch, env, expected):
+        """Test that S3 configuration follows correct precedence (None unsets a variable)"""
+        for name, value in env.items():
+            if value is None:
+                monkeypatch.delenv(name, raising=False)
+            else:
+                monkeypatch.setenv(name, value)
+        s3_config = S3Config.from_shared_config(SharedInfrastructureConfig())
+        
+        for field, value in expected.items():
+            assert getattr(s3_config, field) == value
     
     def test_error_handling_scenarios(self):
         """Test various error handling scenarios"""
@@ -3,58 +3,47 @@ Tests for Token Verifier module
 """
 import pytest
 import jwt
-import os
-from unittest.mock import patch, MagicMock
-from fastapi import HTTPException, Request
+from types import SimpleNamespace
+from fastapi import HTTPException
+from starlette.datastructures import Headers
 from shared.auth.token_verifier import get_token_from_request, verify_token
 
+# Keep this module on one xdist worker under --dist loadgroup so session fixtures are built once
+pytestmark = pytest.mark.xdist_group("jwt")
+
+
+@pytest.fixture
+def jwt_env(monkeypatch, jwt_secret):
+    """Point the verifier at the secret the session token fixtures are signed with"""
+    monkeypatch.setenv("JWT_SECRET", jwt_secret)
+    monkeypatch.setenv("JWT_ALGORITHM", "HS256")
+
 
 class TestGetTokenFromRequest:
     """Test token extraction from request headers"""
     
-    def test_get_token_from_request_success(self):
-        """Test successful token extraction from Authorization header"""
-        # Create mock request with proper Authorization header
-        mock_request = MagicMock(spec=Request)
-        mock_request.headers = {"Authorization": "Bearer test-jwt-token"}
+    @pytest.mark.parametrize("authorization,expected", [
+        ("Bearer test-jwt-token", "test-jwt-token"),
+        ("Bearer ", ""),  # Empty token part is passed through to verification
+        ("Bearer abc.def.ghi extra", "abc.def.ghi"),
+    ], ids=["success", "empty-token", "trailing-garbage"])
+    def test_get_token_from_request_success(self, authorization, expected):
+        """Test token extraction from a Bearer Authorization header"""
+        mock_request = SimpleNamespace(headers={"Authorization": authorization})
         
         token = get_token_from_request(mock_request)
-        assert token == "test-jwt-token"
+        assert token == expected
     
-    def test_get_token_from_request_missing_header(self):
-        """Test token extraction fails when Authorization header is missing"""
-        mock_request = MagicMock(spec=Request)
-        mock_request.headers = {}
-        
-        with pytest.raises(HTTPException) as exc_info:
-            get_token_from_request(mock_request)
-        
-        assert exc_info.value.status_code == 401
-        assert "Missing token" in str(exc_info.value.detail)
-    
-    def test_get_token_from_request_wrong_format(self):
-        """Test token extraction fails when Authorization header has wrong format"""
-        mock_request = MagicMock(spec=Request)
-        mock_request.headers = {"Authorization": "Basic test-token"}
-        
-        with pytest.raises(HTTPException) as exc_info:
-            get_token_from_request(mock_request)
-        
-        assert exc_info.value.status_code == 401
-        assert "Missing token" in str(exc_info.value.detail)
-    
-    def test_get_token_from_request_empty_token(self):
-        """Test token extraction fails when token part is empty"""
-        mock_request = MagicMock(spec=Request)
-        mock_request.headers = {"Authorization": "Bearer "}
-        
-        token = get_token_from_request(mock_request)
-        assert token == ""
-    
-    def test_get_token_from_request_malformed_header(self):
-        """Test token extraction fails with malformed Authorization header"""
-        mock_request = MagicMock(spec=Request)
-        mock_request.headers = {"Authorization": "Bearer"}
+    @pytest.mark.parametrize("headers", [
+        {},
+        {"Authorization": "Basic test-token"},
+        {"Authorization": "Bearer"},
+        {"Authorization": "bearer test-token"},
+        {"Authorization": ""},
+    ], ids=["missing-header", "wrong-scheme", "malformed", "lowercase-scheme", "empty-header"])
+    def test_get_token_from_request_missing_token(self, headers):
+        """Test token extraction fails with 401 when there is no Bearer token"""
+        mock_request = SimpleNamespace(headers=headers)
         
         with pytest.raises(HTTPException) as exc_info:
             get_token_from_request(mock_request)
@@ -63,209 +52,114 @@ class TestGetTokenFromRequest:
         assert "Missing token" in str(exc_info.value.detail)
 
 
+@pytest.mark.usefixtures("jwt_env")
 class TestVerifyToken:
     """Test JWT token verification"""
     
-    def test_verify_token_success(self):
+    def test_verify_token_success(self, valid_hs256_token):
         """Test successful token verification"""
-        test_payload = {"user_id": "123", "username": "testuser"}
-        test_secret = "test-secret-key"
-        test_algorithm = "HS256"
-        
-        # Create a valid JWT token
-        test_token = jwt.encode(test_payload, test_secret, algorithm=test_algorithm)
-        
-        with patch.dict(os.environ, {
-            "JWT_SECRET": test_secret,
-            "JWT_ALGORITHM": test_algorithm
-        }):
-            result = verify_token(test_token)
-            assert result["user_id"] == "123"
-            assert result["username"] == "testuser"
+        result = verify_token(valid_hs256_token)
+        assert result["user_id"] == "123"
+        assert result["username"] == "testuser"
     
-    def test_verify_token_invalid_signature(self):
+    def test_verify_token_invalid_signature(self, valid_hs256_token, monkeypatch):
         """Test token verification fails with invalid signature"""
-        test_payload = {"user_id": "123", "username": "testuser"}
-        wrong_secret = "wrong-secret"
-        correct_secret = "correct-secret"
+        # Token was signed with the session secret, verify against another one
+        monkeypatch.setenv("JWT_SECRET", "correct-secret")
         
-        # Create token with wrong secret
-        test_token = jwt.encode(test_payload, wrong_secret, algorithm="HS256")
+        with pytest.raises(HTTPException) as exc_info:
+            verify_token(valid_hs256_token)
         
-        with patch.dict(os.environ, {
-            "JWT_SECRET": correct_secret,
-            "JWT_ALGORITHM": "HS256"
-        }):
-            with pytest.raises(HTTPException) as exc_info:
-                verify_token(test_token)
-            
-            assert exc_info.value.status_code == 403
-            assert "Invalid token" in str(exc_info.value.detail)
+        assert exc_info.value.status_code == 403
+        assert "Invalid token" in str(exc_info.value.detail)
     
-    def test_verify_token_expired(self):
+    def test_verify_token_expired(self, expired_hs256_token):
         """Test token verification fails with expired token"""
-        import time
-        from datetime import datetime, timedelta
-        
-        test_payload = {
-            "user_id": "123",
-            "username": "testuser",
-            "exp": datetime.utcnow() - timedelta(hours=1)  # Expired 1 hour ago
-        }
-        test_secret = "test-secret-key"
-        
-        test_token = jwt.encode(test_payload, test_secret, algorithm="HS256")
+        with pytest.raises(HTTPException) as exc_info:
+            verify_token(expired_hs256_token)
         
-        with patch.dict(os.environ, {
-            "JWT_SECRET": test_secret,
-            "JWT_ALGORITHM": "HS256"
-        }):
-            with pytest.raises(HTTPException) as exc_info:
-                verify_token(test_token)
-            
-            assert exc_info.value.status_code == 403
-            assert "Invalid token" in str(exc_info.value.detail)
+        assert exc_info.value.status_code == 403
+        assert "Invalid token" in str(exc_info.value.detail)
     
     def test_verify_token_malformed(self):
         """Test token verification fails with malformed token"""
         malformed_token = "this.is.not.a.valid.jwt.token"
         
-        with patch.dict(os.environ, {
-            "JWT_SECRET": "test-secret",
-            "JWT_ALGORITHM": "HS256"
-        }):
-            with pytest.raises(HTTPException) as exc_info:
-                verify_token(malformed_token)
-            
-            assert exc_info.value.status_code == 403
-            assert "Invalid token" in str(exc_info.value.detail)
+        with pytest.raises(HTTPException) as exc_info:
+            verify_token(malformed_token)
+        
+        assert exc_info.value.status_code == 403
+        assert "Invalid token" in str(exc_info.value.detail)
     
     def test_verify_token_empty(self):
         """Test token verification fails with empty token"""
-        with patch.dict(os.environ, {
-            "JWT_SECRET": "test-secret",
-            "JWT_ALGORITHM": "HS256"
-        }):
-            with pytest.raises(HTTPException) as exc_info:
-                verify_token("")
-            
-            assert exc_info.value.status_code == 403
-            assert "Invalid token" in str(exc_info.value.detail)
+        with pytest.raises(HTTPException) as exc_info:
+            verify_token("")
+        
+        assert exc_info.value.status_code == 403
+        assert "Invalid token" in str(exc_info.value.detail)
     
-    def test_verify_token_wrong_algorithm(self):
+    def test_verify_token_wrong_algorithm(self, valid_hs256_token, monkeypatch):
         """Test token verification fails when algorithm doesn't match"""
-        test_payload = {"user_id": "123", "username": "testuser"}
-        test_secret = "test-secret-key"
+        # Token was signed with HS256, try to verify with HS512
+        monkeypatch.setenv("JWT_ALGORITHM", "HS512")
         
-        # Create token with HS256
-        test_token = jwt.encode(test_payload, test_secret, algorithm="HS256")
+        with pytest.raises(HTTPException) as exc_info:
+            verify_token(valid_hs256_token)
         
-        # Try to verify with HS512
-        with patch.dict(os.environ, {
-            "JWT_SECRET": test_secret,
-            "JWT_ALGORITHM": "HS512"
-        }):
-            with pytest.raises(HTTPException) as exc_info:
-                verify_token(test_token)
-            
-            assert exc_info.value.status_code == 403
-            assert "Invalid token" in str(exc_info.value.detail)
+        assert exc_info.value.status_code == 403
+        assert "Invalid token" in str(exc_info.value.detail)
     
-    def test_verify_token_with_default_env_values(self):
+    def test_verify_token_with_default_env_values(self, monkeypatch):
         """Test token verification with default environment values"""
-        # Clear environment variables to test defaults
-        with patch.dict(os.environ, {}, clear=True):
-            test_payload = {"user_id": "123", "username": "testuser"}
-            # Use default values: JWT_SECRET="secret", JWT_ALGORITHM="HS256"
-            test_token = jwt.encode(test_payload, "secret", algorithm="HS256")
-            
-            result = verify_token(test_token)
-            assert result["user_id"] == "123"
-            assert result["username"] == "testuser"
+        # Unset the JWT variables set by jwt_env to test defaults
+        monkeypatch.delenv("JWT_SECRET")
+        monkeypatch.delenv("JWT_ALGORITHM")
+        
+        test_payload = {"user_id": "123", "username": "testuser"}
+        # Use default values: JWT_SECRET="secret", JWT_ALGORITHM="HS256"
+        test_token = jwt.encode(test_payload, "secret", algorithm="HS256")
+        
+        result = verify_token(test_token)
+        assert result["user_id"] == "123"
+        assert result["username"] == "testuser"
 
 
+@pytest.mark.usefixtures("jwt_env")
 class TestTokenVerifierIntegration:
     """Integration tests for token verifier functionality"""
     
-    def test_full_request_to_verification_flow(self):
+    def test_full_request_to_verification_flow(self, valid_hs256_token):
         """Test complete flow from request to verified token"""
-        # Setup test data
-        test_payload = {"user_id": "456", "username": "integrationuser", "role": "admin"}
-        test_secret = "integration-test-secret"
-        test_algorithm = "HS256"
+        mock_request = SimpleNamespace(headers={"Authorization": f"Bearer {valid_hs256_token}"})
         
-        # Create valid JWT token
-        test_token = jwt.encode(test_payload, test_secret, algorithm=test_algorithm)
+        # Extract token from request
+        extracted_token = get_token_from_request(mock_request)
         
-        # Create mock request
-        mock_request = MagicMock(spec=Request)
-        mock_request.headers = {"Authorization": f"Bearer {test_token}"}
+        # Verify the extracted token
+        verified_payload = verify_token(extracted_token)
         
-        with patch.dict(os.environ, {
-            "JWT_SECRET": test_secret,
-            "JWT_ALGORITHM": test_algorithm
-        }):
-            # Extract token from request
-            extracted_token = get_token_from_request(mock_request)
-            
-            # Verify the extracted token
-            verified_payload = verify_token(extracted_token)
-            
-            # Verify the payload matches
-            assert verified_payload["user_id"] == "456"
-            assert verified_payload["username"] == "integrationuser"
-            assert verified_payload["role"] == "admin"
+        # Verify the payload matches
+        assert verified_payload["user_id"] == "123"
+        assert verified_payload["username"] == "testuser"
     
-    def test_realistic_jwt_payload(self):
+    def test_realistic_jwt_payload(self, realistic_payload_token):
         """Test with realistic JWT payload structure"""
-        from datetime import datetime, timedelta
-        
-        test_payload = {
-            "sub": "user123",  # Subject
-            "iat": datetime.utcnow(),  # Issued at
-            "exp": datetime.utcnow() + timedelta(hours=1),  # Expiration
-            "aud": "wekare-app",  # Audience
-            "iss": "wekare-auth",  # Issuer
-            "user_id": "123",
-            "username": "johndoe",
-            "email": "john@example.com",
-            "roles": ["user", "patient"]
-        }
-        
-        test_secret = "realistic-test-secret"
-        test_token = jwt.encode(test_payload, test_secret, algorithm="HS256")
-        
-        with patch.dict(os.environ, {
-            "JWT_SECRET": test_secret,
-            "JWT_ALGORITHM": "HS256"
-        }):
-            result = verify_token(test_token)
-            
-            assert result["sub"] == "user123"
-            assert result["user_id"] == "123"
-            assert result["username"] == "johndoe"
-            assert result["email"] == "john@example.com"
-            assert result["roles"] == ["user", "patient"]
-            assert result["aud"] == "wekare-app"
-            assert result["iss"] == "wekare-auth"
+        result = verify_token(realistic_payload_token)
+        
+        assert result["sub"] == "user123"
+        assert result["user_id"] == "123"
+        assert result["username"] == "johndoe"
+        assert result["email"] == "john@example.com"
+        assert result["roles"] == ["user", "patient"]
+        assert result["aud"] == "wekare-app"
+        assert result["iss"] == "wekare-auth"
     
-    def test_case_sensitive_headers(self):
+    @pytest.mark.parametrize("header_key", ["Authorization", "authorization", "AUTHORIZATION"])
+    def test_case_sensitive_headers(self, header_key):
         """Test that header extraction works with different case variations"""
         test_token = "test-token-value"
+        mock_request = SimpleNamespace(headers=Headers({header_key: f"Bearer {test_token}"}))
         
-        # Test different header case variations
-        headers_to_test = [
-            {"Authorization": f"Bearer {test_token}"},
-            {"authorization": f"Bearer {test_token}"},  # lowercase  
-            {"AUTHORIZATION": f"Bearer {test_token}"},  # uppercase
-        ]
-        
-        for headers in headers_to_test:
-            mock_request = MagicMock(spec=Request)
-            # Create a custom headers object that handles case-insensitive lookups
-            mock_headers = MagicMock()
-            mock_headers.get.return_value = headers.get("Authorization") or headers.get("authorization") or headers.get("AUTHORIZATION")
-            mock_request.headers = mock_headers
-            
-            extracted = get_token_from_request(mock_request)
-            assert extracted == test_token 
\ No newline at end of file
+        extracted = get_token_from_request(mock_request)
+        assert extracted == test_token